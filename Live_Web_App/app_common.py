@@ -0,0 +1,53 @@
+# Shared Page Setup - By Heider Jeffer
+#
+# Names shared by the entrypoint and the tool pages in tools/. The pages share
+# the cached compute core (compute.py), the plot renderer (rendering.py) and
+# the Excel export (export.py) through plain imports; this module only holds
+# what the old single script defined at its top.
+#
+# Streamlit deletes the state of every widget that is not drawn in a run, so
+# without help a page's inputs reset whenever the user switches to another
+# tool. Widgets keyed with persist("...") remember the page that drew them,
+# and restore_widget_state() re-registers the widgets of every other page at
+# the top of each run, which keeps their values while the page is hidden.
+import streamlit as st
+
+from lazy_imports import lazy_import
+
+# seaborn (and matplotlib behind it) loads on the first plot drawn; the style is applied once per process
+sns = lazy_import("seaborn", on_load=lambda module: module.set(style="whitegrid"))
+
+# =========================
+# --- User Info ----------
+# =========================
+USER_NAME = "Heider Jeffer"
+ORG_NAME = "Siemens Energy Digitalization Transformation Engineer"
+
+# =========================
+# --- Page State ----------
+# =========================
+PERSISTENT_KEYS = "_persistent_widget_keys"
+CURRENT_PAGE = "_current_page"
+
+
+def persist(key: str) -> str:
+    """Widget key whose value survives switching to another page."""
+    st.session_state.setdefault(PERSISTENT_KEYS, {})[key] = st.session_state.get(CURRENT_PAGE)
+    return key
+
+
+def restore_widget_state(current_page: str) -> None:
+    """Re-assign the persisted values of the pages not shown in this run.
+
+    Widgets of the current page are drawn anyway; re-assigning them too would
+    make Streamlit warn about a widget with both a default and a state value.
+    """
+    st.session_state[CURRENT_PAGE] = current_page
+    for key, page in st.session_state.get(PERSISTENT_KEYS, {}).items():
+        if page != current_page and key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+
+
+def page_header(title: str) -> None:
+    st.title(f"{title} - By {USER_NAME}")
+    st.markdown(f"**Tailored for {ORG_NAME}**")
@@ -0,0 +1,155 @@
+# Cached Computation Layer - By Heider Jeffer
+#
+# Streamlit reruns the whole dashboard script on every widget change. The pure
+# computation steps live here behind st.cache_data, keyed on the widget inputs
+# (plus a per-session random seed for the "Random" modes) and bounded by
+# ``max_entries`` with least-recently-used eviction. A rerun therefore only
+# recomputes the sections whose inputs actually changed.
+import os
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from metrics import (
+    time_saved_vec,
+    roi_vec,
+    data_quality_vec,
+    is_anomaly_vec,
+    efficiency_over_time_vec,
+)
+from rpa_montecarlo import MonteCarloSummary, simulate_rpa_roi
+from roi_model import ModelCache
+
+CACHE_MAX_ENTRIES = 64
+ML_BLOCK_ROWS = 1024
+MODEL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_cache")
+
+
+def session_seed(key: str = "random_seed") -> int:
+    """Return this session's seed for the "Random" input modes, creating it once."""
+    if key not in st.session_state:
+        st.session_state[key] = int(np.random.SeedSequence().generate_state(1)[0])
+    return st.session_state[key]
+
+
+def reseed(key: str = "random_seed") -> None:
+    st.session_state.pop(key, None)
+
+
+def _dataset_labels(n: int):
+    return [f"DS{i+1}" for i in range(n)]
+
+
+# =========================
+# --- Data Generation -----
+# =========================
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def random_dq_inputs(n: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng([seed, 1])
+    return rng.integers(0, 20, size=n), rng.integers(50, 200, size=n)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def random_roi_inputs(n: int, seed: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng([seed, 2])
+    return (rng.integers(50, 200, size=n), rng.uniform(0.3, 0.9, size=n),
+            rng.integers(10000, 50000, size=n), rng.integers(5000, 20000, size=n))
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def random_anomaly_data(seed: int, size: int = 15) -> np.ndarray:
+    return np.random.default_rng([seed, 3]).integers(90, 150, size=size)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def random_rpa_inputs(cost_components: Tuple[str, ...], benefit_components: Tuple[str, ...],
+                      seed: int) -> Tuple[dict, dict]:
+    rng = np.random.default_rng([seed, 4])
+    costs = {c: int(rng.integers(1000, 20000)) for c in cost_components}
+    benefits = {b: int(rng.integers(5000, 40000)) for b in benefit_components}
+    return costs, benefits
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def random_kpi_table(datasets: Tuple[str, ...], seed: int, stream: int = 5) -> pd.DataFrame:
+    """Sample KPI rows; pages that need their own draw pass a different ``stream``."""
+    rng = np.random.default_rng([seed, stream])
+    n = len(datasets)
+    return pd.DataFrame({
+        'Dataset': list(datasets),
+        'Data_Quality': rng.uniform(0.7, 1.0, size=n).round(2),
+        'Time_Saved': rng.integers(50, 200, size=n),
+        'ROI': rng.integers(-10, 50, size=n),
+        'Efficiency': rng.uniform(0.6, 1.0, size=n).round(2)
+    })
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def random_ml_table(n: int, seed: int) -> pd.DataFrame:
+    """KPI rows drawn in fixed-size blocks, so a larger ``n`` extends a smaller one."""
+    blocks = []
+    for block in range(-(-n // ML_BLOCK_ROWS)):
+        rng = np.random.default_rng([seed, 6, block])
+        blocks.append(pd.DataFrame({
+            'Data_Quality': rng.uniform(0.7, 1.0, ML_BLOCK_ROWS).round(2),
+            'Time_Saved': rng.integers(50, 200, ML_BLOCK_ROWS),
+            'ROI': rng.integers(-10, 50, ML_BLOCK_ROWS),
+            'Efficiency': rng.uniform(0.6, 1.0, ML_BLOCK_ROWS).round(2)
+        }))
+    return pd.concat(blocks, ignore_index=True).head(n)
+
+
+# =========================
+# --- Metric Tables -------
+# =========================
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def efficiency_curve(E_max: float, days: int = 91) -> Tuple[np.ndarray, np.ndarray]:
+    t = np.arange(days)
+    return t, efficiency_over_time_vec(t, E_max)
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def data_quality_table(errors: Sequence[int], totals: Sequence[int]) -> pd.DataFrame:
+    dq_values = data_quality_vec(errors, totals)
+    return pd.DataFrame({'Dataset': _dataset_labels(len(dq_values)), 'Data_Quality': dq_values})
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def time_saved_roi_table(T_manual: Sequence[float], R: Sequence[float],
+                         C_saved: Sequence[float], C_project: Sequence[float]) -> pd.DataFrame:
+    time_saved_values = time_saved_vec(T_manual, R)
+    roi_values = roi_vec(C_saved, C_project)
+    return pd.DataFrame({
+        'Dataset': _dataset_labels(len(time_saved_values)),
+        'Time_Saved': time_saved_values,
+        'ROI': roi_values
+    })
+
+
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def anomaly_flags(data: np.ndarray, k: float) -> Tuple[float, float, np.ndarray]:
+    """Return (mu, sigma, mask) for the threshold anomaly test on ``data``."""
+    mu = float(np.mean(data))
+    sigma = float(np.std(data))
+    return mu, sigma, is_anomaly_vec(data, mu, sigma, k)
+
+
+# =========================
+# --- Monte Carlo ROI -----
+# =========================
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner="Simulating ROI scenarios...")
+def monte_carlo_roi(cost_ranges: Tuple[Tuple[str, Tuple[int, int]], ...],
+                    benefit_ranges: Tuple[Tuple[str, Tuple[int, int]], ...],
+                    n_scenarios: int, seed: int) -> MonteCarloSummary:
+    return simulate_rpa_roi(dict(cost_ranges), dict(benefit_ranges), n_scenarios, seed=seed,
+                            quantiles=(0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99))
+
+
+# =========================
+# --- ROI Model -----------
+# =========================
+@st.cache_resource
+def get_model_cache() -> ModelCache:
+    return ModelCache(MODEL_CACHE_DIR)
@@ -0,0 +1,118 @@
+# Excel Report Export Service - By Heider Jeffer
+#
+# Workbooks are built in a background thread pool as soon as a tab has its
+# data, and memoized by a content hash of the input DataFrames, so the same
+# report is only ever built once. The page script never waits on xlsxwriter:
+# st.download_button receives a callable that returns the finished bytes when
+# the user actually clicks. Large sheets are streamed row by row with
+# xlsxwriter's constant_memory mode.
+import datetime
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from lazy_imports import lazy_import
+from rendering import content_key
+
+xlsxwriter = lazy_import("xlsxwriter")
+
+EXCEL_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_MAX_ENTRIES = 32
+EXPORT_WORKERS = 2
+CONSTANT_MEMORY_ROWS = 50_000
+
+Sheets = Sequence[Tuple[str, pd.DataFrame]]
+
+
+def _cell_value(value):
+    if value is None or value is pd.NaT or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _write_sheet_streaming(workbook, sheet_name: str, frame: pd.DataFrame) -> None:
+    """Write ``frame`` strictly row by row, as constant_memory mode requires."""
+    worksheet = workbook.add_worksheet(sheet_name)
+    header = workbook.add_format({"bold": True})
+    date_format = workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"})
+    worksheet.write_row(0, 0, [str(c) for c in frame.columns], header)
+    for row_idx, row in enumerate(frame.itertuples(index=False, name=None), start=1):
+        for col_idx, value in enumerate(row):
+            value = _cell_value(value)
+            if value is None:
+                continue
+            if isinstance(value, (datetime.datetime, datetime.date)):
+                worksheet.write_datetime(row_idx, col_idx, value, date_format)
+            else:
+                worksheet.write(row_idx, col_idx, value)
+
+
+def build_workbook(sheets: Sheets) -> bytes:
+    """Return the xlsx bytes for ``(sheet_name, frame)`` pairs."""
+    buffer = BytesIO()
+    if max((len(frame) for _, frame in sheets), default=0) >= CONSTANT_MEMORY_ROWS:
+        workbook = xlsxwriter.Workbook(buffer, {"constant_memory": True, "in_memory": False})
+        for sheet_name, frame in sheets:
+            _write_sheet_streaming(workbook, sheet_name, frame)
+        workbook.close()
+    else:
+        with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
+            for sheet_name, frame in sheets:
+                frame.to_excel(writer, sheet_name=sheet_name, index=False)
+    return buffer.getvalue()
+
+
+class ExportService:
+    """Background, memoized builder of Excel reports."""
+
+    def __init__(self, max_entries: int = EXPORT_MAX_ENTRIES, workers: int = EXPORT_WORKERS):
+        self.max_entries = max_entries
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="excel-export")
+        self._futures: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(sheets: Sheets) -> str:
+        return content_key(*[part for name, frame in sheets for part in (name, frame)])
+
+    def submit(self, sheets: Sheets) -> Future:
+        """Start building ``sheets`` unless an identical report is built or pending."""
+        key = self.key(sheets)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and not (future.done() and future.exception() is not None):
+                self._futures.move_to_end(key)
+                return future
+            # Snapshot the frames so later mutation by the page cannot race the worker
+            snapshot = [(name, frame.copy()) for name, frame in sheets]
+            future = self._pool.submit(build_workbook, snapshot)
+            self._futures[key] = future
+            while len(self._futures) > self.max_entries:
+                self._futures.popitem(last=False)
+            return future
+
+
+@st.cache_resource
+def get_export_service() -> ExportService:
+    return ExportService()
+
+
+def excel_download_button(label: str, sheets: Sheets, file_name: str) -> None:
+    """Precompute the workbook in the background and offer it for download."""
+    future = get_export_service().submit(sheets)
+    st.download_button(
+        label=label,
+        data=future.result,
+        file_name=file_name,
+        mime=EXCEL_MIME
+    )
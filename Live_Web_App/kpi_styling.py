@@ -0,0 +1,64 @@
+# KPI Table Styling Engine - By Heider Jeffer
+#
+# Column statistics are computed once per table, and the whole CSS matrix is
+# produced in one vectorized pass for Styler.apply(axis=None), instead of one
+# applymap lambda per cell that recomputed mean/std every time. Large tables
+# are paged so only the visible rows are ever styled and rendered; the
+# anomaly statistics still come from the full table.
+import math
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+ANOMALY_CSS = 'background-color: #ff9999'
+NORMAL_CSS = 'background-color: #b3ffb3'
+DEFAULT_PAGE_SIZE = 100
+
+
+def column_stats(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """Mean and sample std (ddof=1, as Series.std) of ``columns``, computed once."""
+    values = df[list(columns)]
+    return pd.DataFrame({'mean': values.mean(), 'std': values.std()})
+
+
+def anomaly_styles(df: pd.DataFrame, columns: Sequence[str], k: float,
+                   stats: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """CSS matrix shaped like ``df``: red outside mean ± k*std, green inside.
+
+    Columns with zero (or undefined) std and columns not in ``columns`` stay unstyled.
+    """
+    columns = list(columns)
+    if stats is None:
+        stats = column_stats(df, columns)
+    values = df[columns].to_numpy(dtype=float)
+    mean = stats.loc[columns, 'mean'].to_numpy(dtype=float)
+    std = stats.loc[columns, 'std'].to_numpy(dtype=float)
+    is_anomaly = np.abs(values - mean) > k * std
+    styled = np.where(is_anomaly, ANOMALY_CSS, NORMAL_CSS)
+    styled[:, ~(std > 0)] = ''
+    css = pd.DataFrame('', index=df.index, columns=df.columns)
+    css[columns] = styled
+    return css
+
+
+def style_kpi_table(df: pd.DataFrame, columns: Sequence[str], k: float,
+                    stats: Optional[pd.DataFrame] = None):
+    if stats is None:
+        stats = column_stats(df, columns)
+    return df.style.apply(anomaly_styles, axis=None, columns=columns, k=k, stats=stats)
+
+
+def paged_kpi_table(df: pd.DataFrame, columns: Sequence[str], k: float,
+                    page_size: int = DEFAULT_PAGE_SIZE, key: str = "kpi_page") -> pd.DataFrame:
+    """Show one page of ``df`` with anomaly highlighting and return that page."""
+    stats = column_stats(df, columns)
+    n_pages = max(1, math.ceil(len(df) / page_size))
+    page = 1
+    if n_pages > 1:
+        page = st.number_input(f"Page (1-{n_pages}, {page_size} rows each)", 1, n_pages, 1, key=key)
+    start = (page - 1) * page_size
+    visible = df.iloc[start:start + page_size]
+    st.dataframe(style_kpi_table(visible, columns, k, stats))
+    return visible
@@ -0,0 +1,117 @@
+# Lazy Module Loading - By Heider Jeffer
+#
+# Heavy dependencies (seaborn, matplotlib, xlsxwriter) are bound at module
+# level as LazyModule proxies. The real import happens on the first attribute
+# access, i.e. only when a tab actually draws a plot or builds a workbook, so
+# cold start and first paint only pay for streamlit, numpy and pandas.
+# Every import that goes through this module is timed; import_report() lists
+# what was loaded in this process and how long it took, and
+# measure_cold_imports() measures each module's cold import cost in a fresh
+# interpreter (python -X importtime).
+#
+# Usage:
+#   python lazy_imports.py            # cold import cost of the heavy modules
+import importlib
+import subprocess
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+HEAVY_MODULES = ("seaborn", "matplotlib.figure", "xlsxwriter")
+
+_timings: "OrderedDict[str, float]" = OrderedDict()
+_lazy: Dict[str, "LazyModule"] = {}
+_lock = threading.RLock()
+
+
+def timed_import(name: str) -> types.ModuleType:
+    """``importlib.import_module`` that records how long a first import took."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    with _lock:
+        module = sys.modules.get(name)
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(name)
+            _timings[name] = time.perf_counter() - start
+    return module
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports ``name`` on first attribute access.
+
+    ``on_load`` runs once with the real module, e.g. to apply a plot style
+    once per process instead of on every script run.
+    """
+
+    def __init__(self, name: str, on_load: Optional[Callable[[types.ModuleType], None]] = None):
+        super().__init__(name)
+        self.__dict__["_on_load"] = on_load
+        self.__dict__["_module"] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_module"]
+        if module is None:
+            with _lock:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = timed_import(self.__name__)
+                    if self.__dict__["_on_load"] is not None:
+                        self.__dict__["_on_load"](module)
+                    self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+
+def lazy_import(name: str, on_load: Optional[Callable[[types.ModuleType], None]] = None) -> LazyModule:
+    """Return the (shared) lazy proxy for ``name``."""
+    with _lock:
+        proxy = _lazy.get(name)
+        if proxy is None:
+            proxy = _lazy[name] = LazyModule(name, on_load)
+        return proxy
+
+
+def import_report() -> List[Tuple[str, bool, Optional[float]]]:
+    """(module, loaded, seconds) for every lazy module plus any other timed import.
+
+    ``seconds`` is None when the module was already imported elsewhere.
+    """
+    with _lock:
+        rows = [(name, proxy.loaded, _timings.get(name)) for name, proxy in _lazy.items()]
+        rows += [(name, True, seconds) for name, seconds in _timings.items() if name not in _lazy]
+    return rows
+
+
+def measure_cold_imports(modules: Sequence[str] = HEAVY_MODULES) -> List[Tuple[str, Optional[float]]]:
+    """Cumulative cold import time of each module in a fresh interpreter, in seconds."""
+    results = []
+    for name in modules:
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {name}"],
+                              capture_output=True, text=True)
+        seconds = None
+        for line in proc.stderr.splitlines():
+            # "import time:   self [us] | cumulative | imported package"
+            parts = [part.strip() for part in line.removeprefix("import time:").split("|")]
+            if proc.returncode == 0 and len(parts) == 3 and parts[2] == name:
+                seconds = int(parts[1]) / 1e6
+        results.append((name, seconds))
+    return results
+
+
+if __name__ == "__main__":
+    for module, seconds in measure_cold_imports():
+        print(f"{module:<20} {'not installed' if seconds is None else f'{seconds * 1000:8.1f} ms'}")
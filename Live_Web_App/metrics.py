@@ -0,0 +1,94 @@
+# Vectorized Metric Kernels - By Heider Jeffer
+#
+# Every ``*_vec`` function accepts scalars, lists, NumPy arrays or pandas
+# Series and computes the whole input in one NumPy pass. Division by zero is
+# handled with masks instead of Python branches. The plain-named functions keep
+# the original one-value-at-a-time API as thin wrappers around the kernels.
+import numpy as np
+import pandas as pd
+
+EFFICIENCY_RAMP_DAYS = 90
+
+
+def _like(values: np.ndarray, *inputs):
+    """Return ``values`` as a Series when any input was a Series, else as an array."""
+    for x in inputs:
+        if isinstance(x, pd.Series):
+            return pd.Series(values, index=x.index)
+    return values
+
+
+# =========================
+# --- Vectorized Kernels --
+# =========================
+def time_saved_vec(T_manual, R):
+    result = np.multiply(np.asarray(T_manual, dtype=float), np.asarray(R, dtype=float))
+    return _like(result, T_manual, R)
+
+
+def roi_vec(C_saved, C_project):
+    """ROI in percent; NaN wherever ``C_project == 0``."""
+    saved = np.asarray(C_saved, dtype=float)
+    project = np.asarray(C_project, dtype=float)
+    valid = project != 0
+    ratio = np.full(np.broadcast(saved, project).shape, np.nan)
+    np.divide(saved - project, project, out=ratio, where=valid)
+    return _like(ratio * 100, C_saved, C_project)
+
+
+def data_quality_vec(N_errors, N_total):
+    """Data quality index in [0, 1]; 0.0 wherever ``N_total == 0``."""
+    errors = np.asarray(N_errors, dtype=float)
+    total = np.asarray(N_total, dtype=float)
+    valid = total != 0
+    ratio = np.zeros(np.broadcast(errors, total).shape)
+    np.divide(errors, total, out=ratio, where=valid)
+    result = np.where(valid, 1 - ratio, 0.0)
+    return _like(result, N_errors, N_total)
+
+
+def is_anomaly_vec(x, mu, sigma, k):
+    deviation = np.abs(np.asarray(x, dtype=float) - np.asarray(mu, dtype=float))
+    result = deviation > np.asarray(k, dtype=float) * np.asarray(sigma, dtype=float)
+    return _like(result, x)
+
+
+def anomaly_mask(x, k: float, ddof: int = 0):
+    """Flag values more than ``k`` standard deviations from the mean of ``x``.
+
+    Computes mu and sigma once for the whole input. Use ``ddof=1`` to match
+    pandas' ``Series.std()``.
+    """
+    values = np.asarray(x, dtype=float)
+    if values.size == 0:
+        return _like(np.zeros(0, dtype=bool), x)
+    return is_anomaly_vec(x, values.mean(), values.std(ddof=ddof), k)
+
+
+def efficiency_over_time_vec(t, E_max):
+    days = np.clip(np.asarray(t, dtype=float), 0, EFFICIENCY_RAMP_DAYS)
+    result = np.asarray(E_max, dtype=float) * (days / EFFICIENCY_RAMP_DAYS)
+    return _like(result, t, E_max)
+
+
+# =========================
+# --- Scalar API ----------
+# =========================
+def time_saved(T_manual: float, R: float) -> float:
+    return float(time_saved_vec(T_manual, R))
+
+
+def roi(C_saved: float, C_project: float) -> float:
+    return float(roi_vec(C_saved, C_project))
+
+
+def data_quality(N_errors: int, N_total: int) -> float:
+    return float(data_quality_vec(N_errors, N_total))
+
+
+def is_anomaly(x_i: float, mu: float, sigma: float, k: float) -> bool:
+    return bool(is_anomaly_vec(x_i, mu, sigma, k))
+
+
+def efficiency_over_time(t: int, E_max: float) -> float:
+    return float(efficiency_over_time_vec(t, E_max))
@@ -0,0 +1,128 @@
+# Figure Render Cache - By Heider Jeffer
+#
+# Every dashboard plot is drawn into a long-lived, pyplot-free Figure "slot"
+# and rasterized once per input key. The finished PNG bytes are kept in a
+# bounded LRU cache, so a rerun with unchanged inputs skips Agg rendering
+# entirely. Line plots update their artists in place (set_data / set_ydata)
+# instead of rebuilding the Figure; plots that cannot be updated (seaborn
+# heatmaps/histograms) clear and redraw the same Figure. No Figure is ever
+# registered with pyplot, so nothing accumulates over a long session.
+# matplotlib itself is imported lazily, on the first cache miss.
+import hashlib
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Callable, Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from lazy_imports import lazy_import
+
+mpl_agg = lazy_import("matplotlib.backends.backend_agg")
+mpl_figure = lazy_import("matplotlib.figure")
+
+PNG_CACHE_MAX_ENTRIES = 128
+SAVEFIG_KWARGS = {"format": "png", "dpi": 200, "bbox_inches": "tight"}
+
+
+def content_key(*objs) -> str:
+    """Stable hash of plot inputs (arrays, DataFrames, Series, scalars)."""
+    digest = hashlib.sha1()
+    for obj in objs:
+        if isinstance(obj, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+            digest.update(repr(list(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name).encode())
+        elif isinstance(obj, np.ndarray):
+            digest.update(str(obj.dtype).encode())
+            digest.update(np.ascontiguousarray(obj).tobytes())
+        else:
+            digest.update(repr(obj).encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class FigureSlot:
+    """A reusable Figure/Axes pair plus the named artists drawn on it."""
+
+    def __init__(self, figsize: Tuple[float, float]):
+        self.figure = mpl_figure.Figure(figsize=figsize)
+        mpl_agg.FigureCanvasAgg(self.figure)
+        self.ax = self.figure.subplots()
+        self.artists: Dict[str, object] = {}
+
+    def reset(self) -> None:
+        """Drop every artist (and extra axes such as colorbars) for a full redraw."""
+        self.figure.clear()
+        self.ax = self.figure.subplots()
+        self.artists = {}
+
+    def line(self, name: str, x, y, *fmt, **style):
+        """Create the named Line2D once, then only update its data."""
+        artist = self.artists.get(name)
+        if artist is None:
+            artist, = self.ax.plot(x, y, *fmt, **style)
+            self.artists[name] = artist
+        else:
+            artist.set_data(x, y)
+        return artist
+
+    def hline(self, name: str, y: float, **style):
+        artist = self.artists.get(name)
+        if artist is None:
+            artist = self.ax.axhline(y, **style)
+            self.artists[name] = artist
+        else:
+            artist.set_ydata([y, y])
+        return artist
+
+    def rescale(self) -> None:
+        self.ax.relim()
+        self.ax.autoscale_view()
+
+
+class PlotRenderer:
+    """Bounded LRU cache of PNG bytes in front of a fixed set of FigureSlots."""
+
+    def __init__(self, max_entries: int = PNG_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._png: "OrderedDict[Tuple[str, Hashable], bytes]" = OrderedDict()
+        self._slots: Dict[str, FigureSlot] = {}
+        self._lock = threading.Lock()
+
+    def png(self, name: str, key: Hashable, draw: Callable[[FigureSlot], None],
+            figsize: Tuple[float, float]) -> bytes:
+        cache_key = (name, key)
+        with self._lock:
+            cached = self._png.get(cache_key)
+            if cached is not None:
+                self._png.move_to_end(cache_key)
+                return cached
+            slot = self._slots.get(name)
+            if slot is None:
+                slot = self._slots[name] = FigureSlot(figsize)
+            draw(slot)
+            buffer = BytesIO()
+            slot.figure.savefig(buffer, **SAVEFIG_KWARGS)
+            data = buffer.getvalue()
+            self._png[cache_key] = data
+            while len(self._png) > self.max_entries:
+                self._png.popitem(last=False)
+            return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._png.clear()
+            self._slots.clear()
+
+
+@st.cache_resource
+def get_renderer() -> PlotRenderer:
+    return PlotRenderer()
+
+
+def show_plot(name: str, key: Hashable, draw: Callable[[FigureSlot], None],
+              figsize: Tuple[float, float]) -> None:
+    """Render (or fetch) the plot ``name`` for ``key`` and display it."""
+    st.image(get_renderer().png(name, key, draw, figsize), width="stretch")
@@ -0,0 +1,205 @@
+# Incremental ROI Regression Model - By Heider Jeffer
+#
+# Ordinary least squares fitted from sufficient statistics: X^T X, X^T y and
+# the row count are all that is needed to solve for the coefficients, and they
+# are plain sums, so new KPI rows are folded in with one matrix product and no
+# pass over the old rows. The result is the same fit as sklearn's
+# LinearRegression, without importing sklearn.
+#
+# ModelCache keeps fitted models keyed by a hash of the training rows (in
+# memory, and optionally as .npz files on disk, least recently used first
+# out). When the training table grows, the model of its longest cached prefix
+# is reused and only the new rows are added.
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class IncrementalOLS:
+    """Linear regression with intercept, trained through ``partial_fit``.
+
+    Mirrors the parts of the sklearn estimator the dashboard uses:
+    ``coef_``, ``intercept_`` and ``predict``.
+    """
+
+    def __init__(self, features: Sequence[str]):
+        self.features = list(features)
+        p = len(self.features) + 1  # + intercept column
+        self.xtx = np.zeros((p, p))
+        self.xty = np.zeros(p)
+        self.n_rows = 0
+        self._beta: Optional[np.ndarray] = None
+
+    def _design(self, X) -> np.ndarray:
+        X = X[self.features].to_numpy(dtype=float) if isinstance(X, pd.DataFrame) else np.asarray(X, dtype=float)
+        return np.column_stack([np.ones(len(X)), X])
+
+    def partial_fit(self, X, y) -> "IncrementalOLS":
+        A = self._design(X)
+        self.xtx += A.T @ A
+        self.xty += A.T @ np.asarray(y, dtype=float)
+        self.n_rows += len(A)
+        self._beta = None
+        return self
+
+    @property
+    def beta(self) -> np.ndarray:
+        if self._beta is None:
+            # lstsq gives the minimum-norm solution when features are collinear, like LinearRegression
+            self._beta = np.linalg.lstsq(self.xtx, self.xty, rcond=None)[0]
+        return self._beta
+
+    @property
+    def coef_(self) -> np.ndarray:
+        return self.beta[1:]
+
+    @property
+    def intercept_(self) -> float:
+        return float(self.beta[0])
+
+    def predict(self, X) -> np.ndarray:
+        return self._design(X) @ self.beta
+
+    def copy(self) -> "IncrementalOLS":
+        clone = IncrementalOLS(self.features)
+        clone.xtx, clone.xty, clone.n_rows = self.xtx.copy(), self.xty.copy(), self.n_rows
+        return clone
+
+
+def prefix_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Per-row content hashes; a prefix of rows is identified by hashing a prefix of these."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _prefix_key(row_hashes: np.ndarray, n: int, features: Sequence[str], target: str) -> str:
+    digest = hashlib.sha1(repr((list(features), target)).encode("utf-8"))
+    digest.update(row_hashes[:n].tobytes())
+    return digest.hexdigest()
+
+
+class ModelCache:
+    """Fitted IncrementalOLS models keyed by the hash of their training rows.
+
+    Args:
+        directory: Optional directory the models are also persisted to.
+        max_entries: In-memory LRU size.
+        max_files: Number of model files kept in ``directory``; the least
+            recently used (by mtime) are deleted beyond it.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 32, max_files: int = 256):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_files = max_files
+        self._models: "OrderedDict[str, IncrementalOLS]" = OrderedDict()
+        # Model files on disk, file name -> training rows, oldest use first
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._scan()
+
+    def _path(self, key: str, n_rows: int) -> str:
+        return os.path.join(self.directory, f"{n_rows}_{key}.npz")
+
+    def _scan(self) -> None:
+        """Index the model files already in ``directory`` (the only directory listing)."""
+        found: Dict[str, Tuple[float, int]] = {}
+        for entry in os.scandir(self.directory):
+            size, _, rest = entry.name.partition("_")
+            if size.isdigit() and rest.endswith(".npz") and ".tmp" not in rest:
+                found[entry.name] = (entry.stat().st_mtime, int(size))
+        for name in sorted(found, key=lambda name: found[name][0]):
+            self._files[name] = found[name][1]
+        self._prune()
+
+    def _prune(self) -> None:
+        # Caller holds the lock (or is __init__)
+        while len(self._files) > self.max_files:
+            name, _ = self._files.popitem(last=False)
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def get(self, key: str, n_rows: int, features: Sequence[str]) -> Optional[IncrementalOLS]:
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+        if not self.directory:
+            return None
+        path = self._path(key, n_rows)
+        name = os.path.basename(path)
+        with self._lock:
+            if name not in self._files:
+                return None
+        try:
+            with np.load(path) as stored:
+                model = IncrementalOLS(features)
+                model.xtx, model.xty, model.n_rows = stored["xtx"], stored["xty"], int(stored["n_rows"])
+            os.utime(path)  # mtime is the file's last use, for the LRU order after a restart
+        except FileNotFoundError:
+            with self._lock:
+                self._files.pop(name, None)
+            return None
+        with self._lock:
+            if name in self._files:
+                self._files.move_to_end(name)
+        self.put(key, model, persist=False)
+        return model
+
+    def put(self, key: str, model: IncrementalOLS, persist: bool = True) -> None:
+        with self._lock:
+            self._models[key] = model
+            self._models.move_to_end(key)
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+        if persist and self.directory:
+            path = self._path(key, model.n_rows)
+            tmp_path = path[:-len(".npz")] + ".tmp.npz"
+            np.savez(tmp_path, xtx=model.xtx, xty=model.xty, n_rows=model.n_rows)
+            os.replace(tmp_path, path)
+            with self._lock:
+                self._files[os.path.basename(path)] = model.n_rows
+                self._files.move_to_end(os.path.basename(path))
+                self._prune()
+
+    def known_sizes(self) -> list:
+        """Training-set sizes of every cached model, largest first."""
+        with self._lock:
+            sizes = {model.n_rows for model in self._models.values()}
+            sizes.update(self._files.values())
+        return sorted(sizes, reverse=True)
+
+    def fit(self, df: pd.DataFrame, features: Sequence[str], target: str) -> Tuple[IncrementalOLS, int]:
+        """Model trained on ``df``; returns it with the number of rows that had to be trained.
+
+        An exact match costs nothing. Otherwise the longest cached prefix of
+        ``df`` is extended with the remaining rows only.
+        """
+        row_hashes = prefix_hashes(df[[*features, target]])
+        n = len(df)
+        key = _prefix_key(row_hashes, n, features, target)
+        model = self.get(key, n, features)
+        if model is not None:
+            return model, 0
+
+        base, start = None, 0
+        for size in self.known_sizes():
+            if size < n:
+                base = self.get(_prefix_key(row_hashes, size, features, target), size, features)
+                if base is not None:
+                    start = size
+                    break
+        model = base.copy() if base is not None else IncrementalOLS(features)
+        new_rows = df.iloc[start:]
+        model.partial_fit(new_rows[list(features)], new_rows[target])
+        self.put(key, model)
+        return model, n - start
@@ -0,0 +1,207 @@
+# Monte Carlo RPA ROI Simulation Engine - By Heider Jeffer
+#
+# Samples whole cost and benefit matrices (scenarios x components) per batch
+# with one vectorized Generator call, scores them with the vectorized
+# calculate_rpa_roi, and folds every batch into a fixed-size histogram plus
+# running moments. Summary quantiles, mean/std and probability of loss are
+# therefore available for millions of scenarios without keeping the samples.
+# Very large runs can be split across a process pool; each worker gets an
+# independent child stream spawned from one SeedSequence, so results are
+# reproducible for a given (seed, workers) pair.
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_BATCH_SIZE = 250_000
+HISTOGRAM_BINS = 16_384
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+Range = Tuple[float, float]
+
+
+def calculate_rpa_roi(costs: dict, benefits: dict) -> float:
+    """
+    Calculate ROI for RPA projects.
+
+    Args:
+        costs (dict): A dictionary of cost components.
+        benefits (dict): A dictionary of benefit components.
+
+    Returns:
+        float: ROI percentage
+    """
+    total_costs = sum(costs.values())
+    total_benefits = sum(benefits.values())
+
+    if total_costs == 0:
+        raise ValueError("Total costs cannot be zero.")
+
+    roi = ((total_benefits - total_costs) / total_costs) * 100
+    return roi
+
+
+def calculate_rpa_roi_vec(cost_matrix: np.ndarray, benefit_matrix: np.ndarray) -> np.ndarray:
+    """ROI (%) per scenario row; NaN where a scenario's total cost is zero."""
+    total_costs = np.asarray(cost_matrix, dtype=float).sum(axis=-1)
+    total_benefits = np.asarray(benefit_matrix, dtype=float).sum(axis=-1)
+    roi = np.full(total_costs.shape, np.nan)
+    np.divide(total_benefits - total_costs, total_costs, out=roi, where=total_costs != 0)
+    return roi * 100
+
+
+def roi_bounds(cost_ranges: Sequence[Range], benefit_ranges: Sequence[Range]) -> Tuple[float, float]:
+    """Exact ROI range: ROI rises with benefits and falls with costs."""
+    c_low = sum(low for low, _ in cost_ranges)
+    c_high = sum(high for _, high in cost_ranges)
+    b_low = sum(low for low, _ in benefit_ranges)
+    b_high = sum(high for _, high in benefit_ranges)
+    if c_low <= 0:
+        raise ValueError("Cost ranges must be strictly positive.")
+    return (b_low - c_high) / c_high * 100, (b_high - c_low) / c_low * 100
+
+
+@dataclass
+class RoiAccumulator:
+    """Mergeable streaming summary of ROI samples over fixed histogram edges."""
+    edges: np.ndarray
+    counts: np.ndarray = None
+    n: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    losses: int = 0
+    minimum: float = np.inf
+    maximum: float = -np.inf
+
+    def __post_init__(self):
+        if self.counts is None:
+            self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+
+    def add(self, roi: np.ndarray) -> None:
+        roi = roi[~np.isnan(roi)]
+        if roi.size == 0:
+            return
+        self.counts += np.histogram(roi, bins=self.edges)[0]
+        self.n += roi.size
+        self.total += float(roi.sum())
+        self.total_sq += float(np.dot(roi, roi))
+        self.losses += int(np.count_nonzero(roi < 0))
+        self.minimum = min(self.minimum, float(roi.min()))
+        self.maximum = max(self.maximum, float(roi.max()))
+
+    def merge(self, other: "RoiAccumulator") -> "RoiAccumulator":
+        self.counts += other.counts
+        self.n += other.n
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.losses += other.losses
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Quantile interpolated inside its histogram bin (error <= one bin width)."""
+        if self.n == 0:
+            return float("nan")
+        cumulative = np.cumsum(self.counts)
+        target = q * self.n
+        i = int(np.searchsorted(cumulative, target, side="left"))
+        i = min(i, len(self.counts) - 1)
+        before = cumulative[i - 1] if i else 0
+        inside = self.counts[i]
+        fraction = (target - before) / inside if inside else 0.0
+        value = self.edges[i] + fraction * (self.edges[i + 1] - self.edges[i])
+        return float(np.clip(value, self.minimum, self.maximum))
+
+
+@dataclass
+class MonteCarloSummary:
+    n_scenarios: int
+    mean: float
+    std: float
+    prob_loss: float
+    minimum: float
+    maximum: float
+    quantiles: Dict[float, float] = field(default_factory=dict)
+    hist_counts: Optional[np.ndarray] = None
+    hist_edges: Optional[np.ndarray] = None
+
+    def coarse_histogram(self, low: float, high: float, bins: int = 80) -> Tuple[np.ndarray, np.ndarray]:
+        """Merge adjacent histogram bins between ``low`` and ``high`` down to about ``bins`` bars."""
+        start = max(int(np.searchsorted(self.hist_edges, low, side="right")) - 1, 0)
+        stop = max(int(np.searchsorted(self.hist_edges, high, side="left")), start + 1)
+        counts = self.hist_counts[start:stop]
+        edges = self.hist_edges[start:stop + 1]
+        factor = max(1, len(counts) // bins)
+        usable = len(counts) // factor * factor
+        return counts[:usable].reshape(-1, factor).sum(axis=1), edges[:usable + 1:factor]
+
+
+def _simulate_chunk(cost_ranges: Sequence[Range], benefit_ranges: Sequence[Range], n: int,
+                    seed_seq: np.random.SeedSequence, edges: np.ndarray,
+                    batch_size: int) -> RoiAccumulator:
+    """Run ``n`` scenarios on one independent stream. Module-level for worker processes."""
+    rng = np.random.default_rng(seed_seq)
+    c_low, c_high = np.array(cost_ranges, dtype=float).T
+    b_low, b_high = np.array(benefit_ranges, dtype=float).T
+    acc = RoiAccumulator(edges)
+    remaining = n
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        # One call per matrix: every scenario x component drawn at once
+        costs = rng.integers(c_low, c_high, size=(size, c_low.size), endpoint=False, dtype=np.int64)
+        benefits = rng.integers(b_low, b_high, size=(size, b_low.size), endpoint=False, dtype=np.int64)
+        acc.add(calculate_rpa_roi_vec(costs, benefits))
+        remaining -= size
+    return acc
+
+
+def simulate_rpa_roi(cost_ranges: Mapping[str, Range], benefit_ranges: Mapping[str, Range],
+                     n_scenarios: int = 1_000_000, seed: Optional[int] = None,
+                     workers: int = 1, batch_size: int = DEFAULT_BATCH_SIZE,
+                     quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                     bins: int = HISTOGRAM_BINS) -> MonteCarloSummary:
+    """Monte Carlo ROI distribution for uniformly sampled integer cost/benefit components.
+
+    Args:
+        cost_ranges: ``{component: (low, high)}``, high exclusive like ``np.random.randint``.
+        benefit_ranges: Same for benefit components.
+        n_scenarios: Total number of simulated projects.
+        seed: Root seed; each worker gets an independent spawned stream.
+        workers: Processes to split the run across (1 runs in-process).
+        batch_size: Scenarios sampled per vectorized call; bounds memory.
+        quantiles: Quantile levels to report.
+        bins: Histogram resolution used for the quantiles.
+    """
+    c_ranges = [tuple(r) for r in cost_ranges.values()]
+    b_ranges = [tuple(r) for r in benefit_ranges.values()]
+    low, high = roi_bounds(c_ranges, b_ranges)
+    edges = np.linspace(low, high, bins + 1) if high > low else np.array([low - 0.5, high + 0.5])
+
+    workers = max(1, min(workers, n_scenarios))
+    children = np.random.SeedSequence(seed).spawn(workers)
+    shares = [n_scenarios // workers + (i < n_scenarios % workers) for i in range(workers)]
+    if workers == 1:
+        acc = _simulate_chunk(c_ranges, b_ranges, shares[0], children[0], edges, batch_size)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_simulate_chunk, c_ranges, b_ranges, share, child, edges, batch_size)
+                       for share, child in zip(shares, children)]
+            acc = RoiAccumulator(edges)
+            for future in futures:
+                acc.merge(future.result())
+
+    mean = acc.total / acc.n if acc.n else float("nan")
+    variance = max(acc.total_sq / acc.n - mean * mean, 0.0) if acc.n else float("nan")
+    return MonteCarloSummary(
+        n_scenarios=acc.n,
+        mean=mean,
+        std=float(np.sqrt(variance)),
+        prob_loss=acc.losses / acc.n if acc.n else float("nan"),
+        minimum=acc.minimum,
+        maximum=acc.maximum,
+        quantiles={q: acc.quantile(q) for q in quantiles},
+        hist_counts=acc.counts,
+        hist_edges=acc.edges,
+    )
@@ -0,0 +1,32 @@
+# AI Insights Page - By Heider Jeffer
+import streamlit as st
+import numpy as np
+import compute
+from app_common import page_header, sns
+from rendering import content_key, show_plot
+
+AI_INSIGHTS_STREAM = 7  # own random stream, so these projects differ from the KPI page's
+
+seed = compute.session_seed()
+
+page_header("AI Insights Module")
+
+# Sample project data (drawn once per session seed, cached across reruns)
+datasets = [f"Project {c}" for c in ["A","B","C","D","E"]]
+df_ai = compute.random_kpi_table(tuple(datasets), seed, stream=AI_INSIGHTS_STREAM).copy()
+
+st.header("Project Summary")
+st.dataframe(df_ai)
+
+st.header("AI Insights")
+avg_roi = df_ai['ROI'].mean()
+df_ai['AI_Insight'] = np.where(df_ai['ROI'] < avg_roi, "Low ROI ⚠️", "Healthy ROI ✅")
+st.dataframe(df_ai[['Dataset', 'ROI', 'AI_Insight']])
+
+st.header("ROI Distribution")
+
+def draw_ai_distribution(slot):
+    slot.reset()
+    sns.histplot(df_ai['ROI'], color='purple', kde=True, bins=10, ax=slot.ax)
+    slot.ax.set_title("AI ROI Distribution Across Projects")
+show_plot('ai_distribution', content_key(df_ai['ROI']), draw_ai_distribution, figsize=(10,5))
@@ -0,0 +1,95 @@
+# Dynamic Metrics Page - By Heider Jeffer
+import streamlit as st
+import numpy as np
+import pandas as pd
+import compute
+from app_common import USER_NAME, page_header, persist, sns
+from rendering import content_key, show_plot
+from export import excel_download_button
+
+seed = compute.session_seed()
+
+page_header("Dynamic Estimation Metrics")
+
+# 1️⃣ Efficiency
+st.header("1️⃣ First 90 Days Efficiency")
+E_max = st.slider("Maximum Efficiency (E_max)", 0.5, 1.5, 1.0, key=persist("dm_e_max"))
+days, efficiency = compute.efficiency_curve(E_max)
+
+def draw_efficiency(slot):
+    slot.line('efficiency', days, efficiency, marker='o', color='green', label='Efficiency')
+    slot.ax.set_xlabel("Day")
+    slot.ax.set_ylabel("Efficiency")
+    slot.rescale()
+show_plot('efficiency', E_max, draw_efficiency, figsize=(10,4))
+
+# 2️⃣ Data Quality
+st.header("2️⃣ Data Quality Simulation")
+mode_dq = st.radio("Select Input Mode:", ["Random", "Manual"], key=persist("dq_mode"))
+if mode_dq == "Random":
+    N_datasets = st.slider("Number of Datasets", 2, 10, 5, key=persist("dm_n_datasets"))
+    errors_list, total_list = compute.random_dq_inputs(N_datasets, seed)
+else:
+    errors_input = st.text_input("Enter errors per dataset (comma-separated)", "5,2,10", key=persist("dm_errors"))
+    total_input = st.text_input("Enter total records per dataset (comma-separated)", "100,50,120", key=persist("dm_totals"))
+    errors_list = list(map(int, errors_input.split(',')))
+    total_list = list(map(int, total_input.split(',')))
+    N_datasets = len(errors_list)
+df_dq = compute.data_quality_table(tuple(errors_list), tuple(total_list))
+st.dataframe(df_dq)
+
+def draw_dq_heatmap(slot):
+    slot.reset()
+    sns.heatmap(df_dq[['Data_Quality']].T, annot=True, cmap='YlGnBu', ax=slot.ax)
+show_plot('dq_heatmap', content_key(df_dq), draw_dq_heatmap, figsize=(6,3))
+
+# 3️⃣ Time Saved & ROI
+st.header("3️⃣ Time Saved & ROI Simulation")
+mode_roi = st.radio("Select Input Mode:", ["Random", "Manual"], key=persist("roi_mode"))
+if mode_roi == "Random":
+    T_manual_list, R_list, C_saved_list, C_project_list = compute.random_roi_inputs(N_datasets, seed)
+else:
+    T_manual_input = st.text_input("Manual times (comma-separated)", "100,120,90", key=persist("dm_t_manual"))
+    R_input = st.text_input("Automation rates (comma-separated)", "0.6,0.5,0.7", key=persist("dm_rates"))
+    C_saved_input = st.text_input("Cost saved (comma-separated)", "20000,15000,25000", key=persist("dm_cost_saved"))
+    C_project_input = st.text_input("Project cost (comma-separated)", "5000,7000,10000", key=persist("dm_project_cost"))
+    T_manual_list = list(map(float, T_manual_input.split(',')))
+    R_list = list(map(float, R_input.split(',')))
+    C_saved_list = list(map(float, C_saved_input.split(',')))
+    C_project_list = list(map(float, C_project_input.split(',')))
+df_metrics = compute.time_saved_roi_table(tuple(T_manual_list), tuple(R_list),
+                                          tuple(C_saved_list), tuple(C_project_list))
+st.dataframe(df_metrics)
+
+def draw_metrics_heatmap(slot):
+    slot.reset()
+    sns.heatmap(df_metrics.set_index('Dataset').T, annot=True, cmap='coolwarm', ax=slot.ax)
+show_plot('metrics_heatmap', content_key(df_metrics), draw_metrics_heatmap, figsize=(6,3))
+
+# 4️⃣ Anomaly Detection
+st.header("4️⃣ Anomaly Detection")
+data = compute.random_anomaly_data(seed)
+k = st.slider("Anomaly Threshold Multiplier (k)", 1.0, 5.0, 2.0, key=persist("dm_k"))
+mu, sigma, anomaly_flags = compute.anomaly_flags(data, k)
+
+def draw_anomalies(slot):
+    slot.line('data', np.arange(len(data)), data, 'bo-', label='Data')
+    slot.line('anomaly', np.flatnonzero(anomaly_flags), data[anomaly_flags], 'ro', markersize=10, label='Anomaly')
+    slot.hline('upper', mu + k*sigma, color='red', linestyle='--', label='Upper Threshold')
+    slot.hline('lower', mu - k*sigma, color='red', linestyle='--', label='Lower Threshold')
+    slot.ax.set_title(f"{USER_NAME}'s Anomaly Detection")
+    slot.rescale()
+    slot.ax.legend()
+show_plot('anomalies', (content_key(data), k), draw_anomalies, figsize=(10,4))
+
+# Excel export
+st.header("💾 Download Metrics Report")
+excel_download_button(
+    "Download Excel Report",
+    (
+        ('Data_Quality', df_dq),
+        ('TimeSaved_ROI', df_metrics),
+        ('Anomalies', pd.DataFrame({'Data': data, 'Anomaly': anomaly_flags})),
+    ),
+    file_name=f"{USER_NAME}_dynamic_estimation.xlsx"
+)
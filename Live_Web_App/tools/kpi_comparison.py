@@ -0,0 +1,56 @@
+# KPI Comparison Page - By Heider Jeffer
+import streamlit as st
+import pandas as pd
+import compute
+from app_common import USER_NAME, page_header, persist, sns
+from rendering import content_key, show_plot
+from export import excel_download_button
+from kpi_styling import paged_kpi_table
+
+seed = compute.session_seed()
+
+page_header("KPI Comparison Dashboard")
+mode_kpi = st.radio("Select Input Mode:", ["Random", "Manual"], key=persist("kpi_mode"))
+datasets = [f"Project {c}" for c in ["A","B","C","D","E"]]
+
+if mode_kpi == "Random":
+    n_projects = st.slider("Number of Projects", 5, 10_000, 5, key=persist("kpi_n_projects"))
+    if n_projects > len(datasets):
+        datasets = [f"Project {i+1}" for i in range(n_projects)]
+    df_kpi = compute.random_kpi_table(tuple(datasets), seed)
+else:
+    dq_input = st.text_input("Data Quality (comma-separated 0-1)", "0.95,0.92,0.85,0.88,0.90", key=persist("kpi_dq"))
+    ts_input = st.text_input("Time Saved (comma-separated)", "100,120,90,150,80", key=persist("kpi_time_saved"))
+    roi_input = st.text_input("ROI % (comma-separated)", "25,30,-5,10,15", key=persist("kpi_roi"))
+    eff_input = st.text_input("Efficiency (0-1, comma-separated)", "0.8,0.9,0.7,0.85,0.95", key=persist("kpi_efficiency"))
+    dq_values = list(map(float, dq_input.split(',')))
+    time_saved_values = list(map(float, ts_input.split(',')))
+    roi_values = list(map(float, roi_input.split(',')))
+    efficiency_values = list(map(float, eff_input.split(',')))
+    df_kpi = pd.DataFrame({
+        'Dataset': datasets,
+        'Data_Quality': dq_values,
+        'Time_Saved': time_saved_values,
+        'ROI': roi_values,
+        'Efficiency': efficiency_values
+    })
+
+st.header("KPI Table with Anomaly Highlighting")
+k_anom = st.slider("Anomaly Threshold Multiplier (k)", 1.0, 5.0, 2.0, key=persist("kpi_k"))
+
+kpi_columns = ['Data_Quality', 'Time_Saved', 'ROI', 'Efficiency']
+df_kpi_page = paged_kpi_table(df_kpi, kpi_columns, k_anom, key=persist("kpi_page"))
+
+st.header("KPI Heatmap with Anomalies")
+
+def draw_kpi_heatmap(slot):
+    slot.reset()
+    sns.heatmap(df_kpi_page.set_index('Dataset').T, annot=len(df_kpi_page) <= 20, cmap='coolwarm', ax=slot.ax)
+show_plot('kpi_heatmap', content_key(df_kpi_page), draw_kpi_heatmap, figsize=(8,4))
+
+st.header("💾 Download KPI Report")
+excel_download_button(
+    "Download KPI Excel Report",
+    (('KPI', df_kpi),),
+    file_name=f"{USER_NAME}_KPI_Comparison.xlsx"
+)
@@ -0,0 +1,45 @@
+# Machine Learning Page - By Heider Jeffer
+import streamlit as st
+import pandas as pd
+import compute
+from app_common import page_header, persist, sns
+from metrics import anomaly_mask
+from rendering import content_key, show_plot
+
+ML_TABLE_ROWS = 1_000
+
+
+page_header("Machine Learning Module")
+
+# Sample KPI-like data; growing N appends projects to the same table
+N = st.slider("Number of datasets", 10, 100_000, 20, key=persist("ml_n"))
+df_ml = compute.random_ml_table(N, 42).copy()
+st.dataframe(df_ml.head())
+
+# Train Linear Regression (OLS from X^T X / X^T y): models are cached by
+# training-data hash, and a larger table only trains its new rows
+features = ['Data_Quality', 'Time_Saved', 'Efficiency']
+model, trained_rows = compute.get_model_cache().fit(df_ml, features, 'ROI')
+st.caption("Model reused from cache" if trained_rows == 0 else
+           f"Trained on {trained_rows:,} new row(s) of {len(df_ml):,}")
+df_ml['Predicted_ROI'] = model.predict(df_ml)
+
+st.subheader("Predicted ROI & Coefficients")
+st.dataframe(pd.DataFrame({'Feature': features, 'Coefficient': model.coef_}))
+st.write(f"Intercept: {model.intercept_:.2f}")
+
+# Anomaly Detection
+k = st.slider("Anomaly Threshold Multiplier (k)", 1.0, 5.0, 2.0, key=persist("ml_k"))
+df_ml['Anomaly'] = anomaly_mask(df_ml['ROI'], k, ddof=1)
+st.dataframe(df_ml.head(ML_TABLE_ROWS))
+if len(df_ml) > ML_TABLE_ROWS:
+    st.caption(f"Showing the first {ML_TABLE_ROWS:,} of {len(df_ml):,} rows")
+
+# Distribution Plot
+
+def draw_ml_distribution(slot):
+    slot.reset()
+    sns.histplot(df_ml['ROI'], color='blue', kde=True, stat="density", bins=15, ax=slot.ax)
+    sns.histplot(df_ml['Predicted_ROI'], color='green', kde=True, stat="density", bins=15, ax=slot.ax, alpha=0.6)
+    slot.ax.set_title("Actual vs Predicted ROI Distribution")
+show_plot('ml_distribution', content_key(df_ml[['ROI', 'Predicted_ROI']]), draw_ml_distribution, figsize=(10,5))
@@ -0,0 +1,94 @@
+# RPA ROI Simulation Page - By Heider Jeffer
+import streamlit as st
+import pandas as pd
+import compute
+from app_common import USER_NAME, page_header, persist
+from rendering import show_plot
+from export import excel_download_button
+from rpa_montecarlo import calculate_rpa_roi
+
+seed = compute.session_seed()
+
+page_header("RPA ROI Simulation")
+mode_rpa = st.radio("Select Input Mode:", ["Random", "Manual"], key=persist("rpa_mode"))
+cost_components = ["License", "Implementation", "Training", "Maintenance"]
+benefit_components = ["Labor Savings", "Error Reduction", "Compliance", "Efficiency"]
+
+if mode_rpa == "Random":
+    costs, benefits = compute.random_rpa_inputs(tuple(cost_components), tuple(benefit_components), seed)
+else:
+    costs_input = st.text_input("Enter costs per component (comma-separated, License,Implementation,Training,Maintenance)", "10000,15000,12000,8000",
+                            key=persist("rpa_costs"))
+    benefits_input = st.text_input("Enter benefits per component (comma-separated, Labor Savings,Error Reduction,Compliance,Efficiency)", "25000,15000,10000,20000",
+                               key=persist("rpa_benefits"))
+    costs_list = list(map(int, costs_input.split(',')))
+    benefits_list = list(map(int, benefits_input.split(',')))
+    costs = dict(zip(cost_components, costs_list))
+    benefits = dict(zip(benefit_components, benefits_list))
+
+st.write(f"{USER_NAME}'s Costs:", costs)
+st.write(f"{USER_NAME}'s Benefits:", benefits)
+
+total_costs = sum(costs.values())
+total_benefits = sum(benefits.values())
+roi_value = calculate_rpa_roi(costs, benefits)
+st.subheader("Results")
+st.write(f"Total Costs: ${total_costs:,}")
+st.write(f"Total Benefits: ${total_benefits:,}")
+st.write(f"ROI: {roi_value:.2f}%")
+if roi_value > 0:
+    st.success(f"{USER_NAME}: Profitable! ✅")
+elif roi_value == 0:
+    st.warning(f"{USER_NAME}: Break-even ⚠️")
+else:
+    st.error(f"{USER_NAME}: Not profitable ❌")
+
+# Monte Carlo ROI distribution
+st.header("🎲 Monte Carlo ROI Distribution")
+n_scenarios = st.select_slider("Number of Scenarios", options=[10_000, 100_000, 1_000_000, 5_000_000], value=100_000,
+                              key=persist("rpa_n_scenarios"))
+if mode_rpa == "Random":
+    cost_ranges = {c: (1000, 20000) for c in cost_components}
+    benefit_ranges = {b: (5000, 40000) for b in benefit_components}
+else:
+    spread = st.slider("Uncertainty around entered values (±%)", 0, 50, 20, key=persist("rpa_spread")) / 100
+    cost_ranges = {c: (int(v * (1 - spread)), int(v * (1 + spread)) + 1) for c, v in costs.items()}
+    benefit_ranges = {b: (int(v * (1 - spread)), int(v * (1 + spread)) + 1) for b, v in benefits.items()}
+try:
+    mc = compute.monte_carlo_roi(tuple(cost_ranges.items()), tuple(benefit_ranges.items()), n_scenarios, seed)
+except ValueError as exc:  # e.g. entered costs so small that a scenario can cost nothing
+    mc = None
+    st.error(f"{USER_NAME}: Monte Carlo simulation not possible: {exc}")
+if mc is not None:
+    st.write(f"Mean ROI: {mc.mean:.2f}% (σ = {mc.std:.2f}%)")
+    st.write(f"Probability of loss: {mc.prob_loss:.2%}")
+    st.dataframe(pd.DataFrame({
+        'Percentile': [f"P{q * 100:g}" for q in mc.quantiles],
+        'ROI (%)': list(mc.quantiles.values())
+    }))
+
+    def draw_mc_distribution(slot):
+        slot.reset()
+        counts, edges = mc.coarse_histogram(mc.quantiles[0.01], mc.quantiles[0.99])
+        slot.ax.stairs(counts / mc.n_scenarios, edges, fill=True, color='steelblue')
+        slot.ax.axvline(0, color='red', linestyle='--', label='Break-even')
+        slot.ax.set_xlabel("ROI (%)")
+        slot.ax.set_ylabel("Share of Scenarios")
+        slot.ax.set_title(f"{USER_NAME}'s RPA ROI Distribution ({mc.n_scenarios:,} scenarios)")
+        slot.ax.legend()
+    show_plot('mc_distribution', (tuple(cost_ranges.items()), tuple(benefit_ranges.items()), n_scenarios, seed),
+              draw_mc_distribution, figsize=(10,4))
+
+# Excel export
+st.header("💾 Download RPA ROI Report")
+df_costs = pd.DataFrame(list(costs.items()), columns=['Cost Component', 'Amount'])
+df_benefits = pd.DataFrame(list(benefits.items()), columns=['Benefit Component', 'Amount'])
+excel_download_button(
+    "Download RPA Excel Report",
+    (
+        ('Costs', df_costs),
+        ('Benefits', df_benefits),
+        ('ROI', pd.DataFrame({'ROI (%)': [roi_value]})),
+    ),
+    file_name=f"{USER_NAME}_RPA_ROI.xlsx"
+)
@@ -0,0 +1,255 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Reproducible performance benchmarks
+# Developed using Python by Heider Jeffer
+#
+# Generates synthetic factory_reports-style workbooks (Date, Production_Units,
+# Machine_ID) at fixed seeds and several scales, then times every pipeline
+# stage and records throughput and peak traced memory to JSON:
+#
+#   metrics    scalar vs vectorized metric functions
+#   read       workbook ingestion (plain read_excel and the ingestion engine)
+#   clean      Step 3 of DailyOutputMonitor
+#   quality    data-quality rules (quality_rules.py) on the raw rows, whole and chunked
+#   aggregate  Step 5, in memory and streaming
+#   export     Step 6 summary workbook (xlsxwriter)
+#   dashboard  one Streamlit rerun per dashboard page (if streamlit is installed)
+#
+# Usage (from the repository root):
+#   python benchmarks/run_benchmarks.py --scales 1 10 100 --output bench.json
+#   python benchmarks/run_benchmarks.py --compare old.json --output new.json
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "Live_Web_App"))
+sys.path.insert(0, os.path.join(ROOT, "jupyter"))
+
+import metrics  # noqa: E402
+from quality_rules import QualityChecker, check_quality  # noqa: E402
+from report_ingestion import IngestionEngine  # noqa: E402
+from streaming_aggregation import aggregate_stream  # noqa: E402
+
+DEFAULT_SCALES = (1, 10, 100, 1000)
+ROWS_PER_FILE = 200
+MACHINES = ("M1", "M2", "M3", "M4")
+SEED = 20250920
+REGRESSION_TOLERANCE = 1.25
+
+
+# =========================
+# --- Measurement ---------
+# =========================
+class Recorder:
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.results: List[Dict] = []
+
+    def measure(self, name: str, fn: Callable[[], object], scale: Optional[int] = None,
+                rows: Optional[int] = None):
+        """Time ``fn`` and record duration, rows/sec and peak traced memory.
+
+        Memory is measured in a second, separate call because tracemalloc
+        slows Python-level code down too much to time it under tracing.
+        """
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        entry = {"stage": name, "scale": scale, "seconds": seconds}
+        if self.trace_memory:
+            gc.collect()
+            tracemalloc.start()
+            try:
+                fn()
+                entry["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        if rows:
+            entry["rows"] = rows
+            entry["rows_per_sec"] = rows / seconds if seconds > 0 else None
+        self.results.append(entry)
+        line = f"  {name:<36} scale={str(scale):<5} {seconds * 1000:10.2f} ms"
+        if "peak_bytes" in entry:
+            line += f"  peak={entry['peak_bytes'] / 2**20:8.2f} MiB"
+        if rows:
+            line += f"  {entry['rows_per_sec']:,.0f} rows/s"
+        print(line)
+        return result
+
+
+# =========================
+# --- Synthetic Data ------
+# =========================
+def generate_reports(directory: str, n_files: int, rows_per_file: int = ROWS_PER_FILE,
+                     seed: int = SEED) -> List[str]:
+    """Write ``n_files`` factory workbooks with a fixed seed per file."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(n_files):
+        rng = np.random.default_rng([seed, i])
+        frame = pd.DataFrame({
+            "Date": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365, rows_per_file), unit="D"),
+            "Production_Units": rng.integers(-2, 300, rows_per_file),
+            "Machine_ID": rng.choice(MACHINES, rows_per_file),
+        })
+        path = os.path.join(directory, f"report{i + 1}.xlsx")
+        frame.to_excel(path, index=False)
+        paths.append(path)
+    return paths
+
+
+# =========================
+# --- Benchmarks ----------
+# =========================
+def bench_metrics(rec: Recorder, n: int = 20_000) -> None:
+    rng = np.random.default_rng(SEED)
+    errors = rng.integers(0, 20, n)
+    totals = rng.integers(0, 200, n)
+    saved = rng.integers(10000, 50000, n).astype(float)
+    project = rng.integers(5000, 20000, n).astype(float)
+    rec.measure("metrics.data_quality.scalar", lambda: [metrics.data_quality(e, t) for e, t in zip(errors, totals)], rows=n)
+    rec.measure("metrics.data_quality.vec", lambda: metrics.data_quality_vec(errors, totals), rows=n)
+    rec.measure("metrics.roi.scalar", lambda: [metrics.roi(cs, cp) for cs, cp in zip(saved, project)], rows=n)
+    rec.measure("metrics.roi.vec", lambda: metrics.roi_vec(saved, project), rows=n)
+    rec.measure("metrics.anomaly_mask.vec", lambda: metrics.anomaly_mask(saved, 2.0), rows=n)
+
+
+def _run_engine(pattern: str, workdir: str) -> None:
+    """One ingestion engine run with its own caches under ``workdir``."""
+    cwd = os.getcwd()
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)  # the columnar cache lives relative to the working directory
+    try:
+        IngestionEngine(pattern, cache_dir=os.path.join(workdir, "ingest_cache")).run()
+    finally:
+        os.chdir(cwd)
+
+
+def clean(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    return df.dropna(subset=["Production_Units"])
+
+
+def bench_pipeline(rec: Recorder, workdir: str, scale: int) -> None:
+    paths = generate_reports(os.path.join(workdir, "factory_reports"), scale)
+    pattern = os.path.join(workdir, "factory_reports", "*.xlsx")
+    rows = scale * ROWS_PER_FILE
+    cold_runs = iter(range(1_000_000))
+
+    raw = rec.measure("read.read_excel_serial", lambda: pd.concat([pd.read_excel(p) for p in paths], ignore_index=True),
+                      scale, rows)
+    rec.measure("read.engine_cold", lambda: _run_engine(pattern, os.path.join(workdir, f"cold{next(cold_runs)}")),
+                scale, rows)
+    warm_dir = os.path.join(workdir, "warm")
+    _run_engine(pattern, warm_dir)
+    rec.measure("read.engine_warm", lambda: _run_engine(pattern, warm_dir), scale, rows)
+
+    df = rec.measure("clean", lambda: clean(raw), scale, rows)
+    rec.measure("quality.rules", lambda: check_quality(raw), scale, rows)
+    rec.measure("quality.rules_chunked", lambda: QualityChecker().check_frame(raw, chunk_rows=10_000), scale, rows)
+    summary = rec.measure("aggregate.in_memory",
+                          lambda: df.groupby("Date")["Production_Units"].sum().reset_index(), scale, rows)
+    rec.measure("aggregate.streaming", lambda: aggregate_stream(paths, chunk_rows=10_000), scale, rows)
+    rec.measure("export.summary_xlsx",
+                lambda: summary.to_excel(os.path.join(workdir, "summary.xlsx"), index=False, engine="xlsxwriter"),
+                scale, len(summary))
+
+
+def bench_dashboard(rec: Recorder) -> None:
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("  streamlit not installed; skipping dashboard reruns")
+        return
+    script = os.path.join(ROOT, "Live_Web_App", "dynamic_estimation_dashboard_full.py")
+    app = AppTest.from_file(script, default_timeout=120)
+    app.run()
+    for page in sorted(glob.glob(os.path.join(ROOT, "Live_Web_App", "tools", "*.py"))):
+        tool = os.path.splitext(os.path.basename(page))[0]
+        app.switch_page(os.path.relpath(page, os.path.dirname(script))).run()  # first visit fills the caches
+        rec.measure(f"dashboard.rerun.{tool}", app.run)
+
+
+# =========================
+# --- Reporting -----------
+# =========================
+def environment() -> Dict:
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "revision": revision,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": SEED,
+        "rows_per_file": ROWS_PER_FILE,
+    }
+
+
+def compare(previous_path: str, current: List[Dict], tolerance: float = REGRESSION_TOLERANCE) -> List[str]:
+    """Return a line for every stage that got slower than ``tolerance`` x the previous run."""
+    with open(previous_path, encoding="utf-8") as fh:
+        previous = {(r["stage"], r["scale"]): r for r in json.load(fh)["results"]}
+    regressions = []
+    for result in current:
+        before = previous.get((result["stage"], result["scale"]))
+        if before and before["seconds"] > 0 and result["seconds"] / before["seconds"] > tolerance:
+            regressions.append(f"{result['stage']} (scale={result['scale']}): "
+                               f"{before['seconds'] * 1000:.2f} ms -> {result['seconds'] * 1000:.2f} ms")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Reproducible performance benchmarks")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="number of synthetic workbooks per pipeline run (default: 1 10 100 1000)")
+    parser.add_argument("--output", default="bench_output.json", help="JSON file to write")
+    parser.add_argument("--compare", help="previous JSON result to check for regressions")
+    parser.add_argument("--skip-dashboard", action="store_true", help="do not time Streamlit reruns")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory pass")
+    args = parser.parse_args(argv)
+
+    rec = Recorder(trace_memory=not args.no_memory)
+    print("Metric functions")
+    bench_metrics(rec)
+    for scale in args.scales:
+        print(f"Pipeline at {scale}x ({scale * ROWS_PER_FILE:,} rows)")
+        with tempfile.TemporaryDirectory(prefix="factory_bench_") as workdir:
+            bench_pipeline(rec, workdir, scale)
+    if not args.skip_dashboard:
+        print("Dashboard reruns")
+        bench_dashboard(rec)
+
+    with open(args.output, "w", encoding="utf-8") as fh:
+        json.dump({"environment": environment(), "results": rec.results}, fh, indent=1)
+    print(f"Wrote {len(rec.results)} results to {args.output}")
+
+    if args.compare:
+        regressions = compare(args.compare, rec.results)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
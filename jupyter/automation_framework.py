@@ -0,0 +1,151 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Batch automation framework: factory reports -> summary report -> ERP upload
+# Developed using Python by Heider Jeffer
+#
+# One batch run discovers factory_reports/* (Excel, CSV or Parquet), ingests
+# the new or changed ones, checks them against the data-quality rules
+# (quality_rules.py), writes their rows into the date-partitioned history
+# store, applies them as deltas to the incremental daily summary store,
+# exports the summary workbook from that store and hands every exported
+# summary report to the ERP upload queue (erp_upload.py), which skips reports
+# the target already holds, so a day whose upload never got queued is sent later.
+# Every stage is timed through PipelineTelemetry, so
+# logs/automation_framework.log carries one JSON line per stage (duration,
+# rows/sec, RSS delta) next to the usual messages.
+#
+# Usage (from the jupyter directory):
+#   python automation_framework.py
+#   python automation_framework.py --profile      # cProfile + tracemalloc dumps in logs/profiles
+#   python automation_framework.py --erp-url http://127.0.0.1:8765
+import argparse
+import datetime
+import glob
+import json
+import logging
+import os
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from erp_upload import DEFAULT_QUEUE_PATH, make_target, upload_reports
+from pipeline_telemetry import DEFAULT_PROFILE_DIR, PipelineTelemetry
+from partitioned_store import PartitionedStore
+from quality_rules import check_quality
+from report_ingestion import IngestionEngine
+from report_publisher import ReportPublisher
+from summary_store import DailySummaryStore
+
+logger = logging.getLogger("automation_framework")
+
+INPUT_PATTERN = "factory_reports/*"  # .xlsx, .csv and .parquet reports
+OUTPUT_DIR = "automated_reports"
+UPLOAD_DIR = os.path.join("upload_area", "ERP")
+LOG_FILE = os.path.join("logs", "automation_framework.log")
+REPORT_PATTERN = "summary_report_*.xlsx"
+
+
+def setup_logging(log_file: str = LOG_FILE) -> None:
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    logging.basicConfig(
+        filename=log_file,
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+
+def export_summary(summary: pd.DataFrame, output_dir: str = OUTPUT_DIR) -> str:
+    """Publish the summary workbook atomically; an unchanged summary reuses the stored workbook."""
+    publisher = ReportPublisher(output_dir)
+    published = publisher.publish_frame(summary, f"summary_report_{datetime.date.today()}.xlsx")
+    publisher.collect_garbage()
+    return published.path
+
+
+def upload(output_dir: str = OUTPUT_DIR, upload_dir: str = UPLOAD_DIR, erp_url: Optional[str] = None) -> dict:
+    """Queue every exported summary report for the ERP and drain the queue; returns job counts by status.
+
+    Reports already uploaded are recognized by their sha256 (in the queue, or
+    on the target side), so only missing days are actually sent.
+    """
+    reports = sorted(glob.glob(os.path.join(output_dir, REPORT_PATTERN)))
+    return upload_reports(reports, make_target(erp_url, upload_dir), DEFAULT_QUEUE_PATH)
+
+
+def run_batch(pattern: str = INPUT_PATTERN, output_dir: str = OUTPUT_DIR, upload_dir: str = UPLOAD_DIR,
+              profile: bool = False, profile_dir: str = DEFAULT_PROFILE_DIR,
+              paths: Optional[Iterable[str]] = None, erp_url: Optional[str] = None) -> Optional[str]:
+    """Run one batch and return the exported report path (None when there was nothing to do).
+
+    ``paths`` skips the glob: only those files (e.g. reported by the file
+    watcher) are checked next to the ones already ingested, and ingested
+    files that no longer exist are retracted. ``erp_url`` uploads to an
+    HTTP endpoint instead of the ``upload_dir`` directory.
+    """
+    telemetry = PipelineTelemetry(logger, profile=profile, profile_dir=profile_dir)
+    engine = IngestionEngine(pattern)
+    store = DailySummaryStore()
+    history = PartitionedStore()
+
+    with telemetry.stage("discover") as stage:
+        files = engine.discover() if paths is None else engine.known_files(paths)
+        stage.rows = len(files)
+    # With no input files left, still run when earlier ones were ingested: they must be retracted
+    if not files and not engine.load_manifest():
+        logger.info("No files to process in this batch run.")
+        logger.info(json.dumps(telemetry.summary()))
+        return None
+
+    with telemetry.stage("ingest") as stage:
+        result = engine.run(files)
+        stage.rows = len(result.delta)
+
+    # Data-quality rules on the raw rows of the new or changed files
+    with telemetry.stage("quality", rows=len(result.delta)) as stage:
+        quality = check_quality(result.delta)
+        stage.extra["error_rows"] = quality.error_rows
+    if len(result.delta):
+        logger.info("Data quality of ingested rows: %s", quality)
+    for _, row in quality.by_file[quality.by_file["Error_Rows"] > 0].iterrows():
+        logger.warning("Quality issues in %s: %d of %d rows (data quality %.3f)",
+                       row["File"], row["Error_Rows"], row["Rows"], row["Data_Quality"])
+
+    # Date/site partitions for history queries (dashboard, anomaly notebook)
+    with telemetry.stage("partition") as stage:
+        stage.rows = history.sync(result)
+
+    # Cleaning happens inside the store, on the delta rows only
+    with telemetry.stage("aggregate") as stage:
+        stage.rows = store.sync(result)
+        summary = store.summary()
+    logger.info("Generated summary with %d rows", len(summary))
+
+    with telemetry.stage("export", rows=len(summary)):
+        report = export_summary(summary, output_dir)
+    logger.info("Exported report: %s", report)
+
+    with telemetry.stage("upload", bytes=os.path.getsize(report)) as stage:
+        uploads = upload(output_dir, upload_dir, erp_url)
+        stage.extra["uploads"] = uploads
+    logger.info("ERP upload of %s -> %s: %s", os.path.join(output_dir, REPORT_PATTERN), erp_url or upload_dir, uploads)
+
+    logger.info(json.dumps(telemetry.summary()))
+    logger.info("Batch run completed.")
+    return report
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Factory report batch automation")
+    parser.add_argument("--pattern", default=INPUT_PATTERN)
+    parser.add_argument("--profile", action="store_true",
+                        help="profile every stage with cProfile and tracemalloc (slow)")
+    parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR)
+    parser.add_argument("--erp-url", help="upload over HTTP (e.g. the erp_upload.py stand-in) instead of "
+                                          "copying into upload_area/ERP")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    run_batch(args.pattern, profile=args.profile, profile_dir=args.profile_dir, erp_url=args.erp_url)
+
+
+if __name__ == "__main__":
+    main()
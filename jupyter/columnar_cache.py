@@ -0,0 +1,129 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Columnar (Parquet/Arrow) cache in front of Excel factory reports
+# Developed using Python by Heider Jeffer
+#
+# Each workbook is parsed through openpyxl once, normalized to typed columns
+# (Date -> datetime64, Production_Units -> integer, Machine_ID -> categorical)
+# and stored as a Parquet file. Later reads are served from that file through
+# a memory map. The source file's fingerprint (mtime, size, sha256) is stored
+# in the Parquet schema metadata and decides when the cached copy is stale.
+# CSV and Parquet reports skip the cache and go straight to their readers in
+# report_readers.py; they are cheap enough to parse that a copy does not pay.
+import hashlib
+import json
+import os
+from typing import Optional, Sequence
+
+import pandas as pd
+
+from report_readers import project, read_report_bytes, read_report_file, reader_for
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # the cache is bypassed without pyarrow
+    pa = None
+    pq = None
+
+DEFAULT_CACHE_DIR = "columnar_cache"
+FINGERPRINT_KEY = b"source_fingerprint"
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ColumnarCache:
+    """Serve Excel workbooks from typed Parquet copies kept in ``cache_dir``."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    @property
+    def enabled(self) -> bool:
+        return pq is not None
+
+    def cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.parquet")
+
+    def _path_key(self, path: str) -> str:
+        return hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+
+    # --- Parquet I/O ---
+    def _stored_fingerprint(self, cache_file: str) -> Optional[dict]:
+        if not os.path.exists(cache_file):
+            return None
+        metadata = pq.read_schema(cache_file, memory_map=True).metadata or {}
+        raw = metadata.get(FINGERPRINT_KEY)
+        return json.loads(raw) if raw else None
+
+    def _load(self, cache_file: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        if columns is not None:
+            names = pq.read_schema(cache_file, memory_map=True).names
+            columns = [col for col in columns if col in names]
+        return pq.read_table(cache_file, columns=columns, memory_map=True).to_pandas()
+
+    def _store(self, frame: pd.DataFrame, cache_file: str, fingerprint: dict) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[FINGERPRINT_KEY] = json.dumps(fingerprint).encode("utf-8")
+        table = table.replace_schema_metadata(metadata)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        pq.write_table(table, tmp_file)
+        os.replace(tmp_file, cache_file)
+
+    # --- Public API ---
+    def read(self, path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Return the typed contents of report ``path``, converting workbooks once.
+
+        ``columns`` limits the result to those columns (all when None).
+        """
+        if not self.enabled or not reader_for(path).cacheable:
+            return read_report_file(path, columns)
+        cache_file = self.cache_path(self._path_key(path))
+        stat = os.stat(path)
+        stored = self._stored_fingerprint(cache_file)
+        if stored is not None and stored["mtime"] == stat.st_mtime and stored["size"] == stat.st_size:
+            return self._load(cache_file, columns)
+
+        fingerprint = {"mtime": stat.st_mtime, "size": stat.st_size, "sha256": _sha256_file(path)}
+        if stored is not None and stored["sha256"] == fingerprint["sha256"]:
+            frame = self._load(cache_file)  # touched but unchanged: refresh the stat only
+        else:
+            frame = read_report_file(path, None)
+        self._store(frame, cache_file, fingerprint)
+        return project(frame, columns)
+
+    def read_bytes(self, data: bytes, sha256: Optional[str] = None, name: str = "upload.xlsx",
+                   columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Return the typed contents of an in-memory report, keyed by its hash.
+
+        ``name`` selects the reader by extension. Pass ``sha256`` when the
+        caller already hashed ``data``.
+        """
+        if not self.enabled or not reader_for(name).cacheable:
+            return read_report_bytes(data, name, columns)
+        sha256 = sha256 or hashlib.sha256(data).hexdigest()
+        cache_file = self.cache_path(sha256)
+        if os.path.exists(cache_file):
+            return self._load(cache_file, columns)
+        frame = read_report_bytes(data, name, None)
+        self._store(frame, cache_file, {"sha256": sha256, "size": len(data)})
+        return project(frame, columns)
+
+
+def read_cached(path: str, cache_dir: str = DEFAULT_CACHE_DIR,
+                columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    return ColumnarCache(cache_dir).read(path, columns)
+
+
+def read_bytes_cached(data: bytes, sha256: Optional[str] = None, cache_dir: str = DEFAULT_CACHE_DIR,
+                      name: str = "upload.xlsx", columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Module-level ``read_bytes`` so uploads can be parsed in worker processes."""
+    return ColumnarCache(cache_dir).read_bytes(data, sha256, name, columns)
@@ -0,0 +1,123 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Compact typed in-memory representation for production records
+# Developed using Python by Heider Jeffer
+#
+# After pd.concat the production frame holds Machine_ID and __source_file as
+# Python strings and Production_Units as float64 whenever a value is missing.
+# compact_frame() shrinks every column to the smallest faithful dtype:
+#   - integers (and whole floats) -> smallest int8/16/32/64, or the nullable
+#     Int8/16/32/64 when values are missing, instead of float-with-NaN
+#   - repeated strings            -> categoricals
+# concat_compact() keeps categoricals categorical across frames by unifying
+# their categories first (plain pd.concat falls back to object otherwise).
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import (
+    is_bool_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+    is_object_dtype,
+    is_string_dtype,
+)
+
+# A string column becomes categorical when its distinct values are at most this share of its rows
+CATEGORY_MAX_RATIO = 0.5
+_INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+@dataclass
+class CompactionReport:
+    rows: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    dtypes: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+    @property
+    def saved_ratio(self) -> float:
+        return 1 - self.bytes_after / self.bytes_before if self.bytes_before else 0.0
+
+    def add(self, other: "CompactionReport") -> "CompactionReport":
+        self.rows += other.rows
+        self.bytes_before += other.bytes_before
+        self.bytes_after += other.bytes_after
+        self.dtypes.update(other.dtypes)
+        return self
+
+    def __str__(self) -> str:
+        return (f"{self.rows:,} rows: {self.bytes_before / 2**20:.2f} MiB -> "
+                f"{self.bytes_after / 2**20:.2f} MiB ({self.saved_ratio:.0%} smaller)")
+
+
+def memory_footprint(frame: pd.DataFrame) -> int:
+    """Deep memory usage of ``frame`` in bytes, strings included."""
+    return int(frame.memory_usage(deep=True).sum())
+
+
+def smallest_int_dtype(low, high, nullable: bool = False):
+    for dtype in _INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return pd.api.types.pandas_dtype(f"Int{info.bits}") if nullable else np.dtype(dtype)
+    return None
+
+
+def compact_series(values: pd.Series, category_max_ratio: float = CATEGORY_MAX_RATIO) -> pd.Series:
+    """Return ``values`` in the smallest dtype that represents it exactly."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.remove_unused_categories()
+    if is_bool_dtype(values.dtype):
+        return values
+    if is_integer_dtype(values.dtype) or is_float_dtype(values.dtype):
+        present = values.dropna()
+        if present.empty:
+            return values
+        if is_float_dtype(values.dtype) and not (present == np.round(present)).all():
+            return values
+        dtype = smallest_int_dtype(present.min(), present.max(), nullable=len(present) < len(values))
+        return values.astype(dtype) if dtype is not None else values
+    if is_object_dtype(values.dtype) or is_string_dtype(values.dtype):
+        if len(values) and values.nunique(dropna=True) <= category_max_ratio * len(values):
+            return values.astype("category")
+    return values
+
+
+def compact_frame(frame: pd.DataFrame, category_max_ratio: float = CATEGORY_MAX_RATIO,
+                  report: Optional[CompactionReport] = None) -> pd.DataFrame:
+    """Compact every column of ``frame``; fill ``report`` with the before/after footprint."""
+    before = memory_footprint(frame) if report is not None else 0
+    compact = pd.DataFrame({col: compact_series(frame[col], category_max_ratio) for col in frame.columns},
+                           index=frame.index)
+    if report is not None:
+        report.add(CompactionReport(
+            rows=len(frame),
+            bytes_before=before,
+            bytes_after=memory_footprint(compact),
+            dtypes={col: (str(frame[col].dtype), str(compact[col].dtype)) for col in frame.columns},
+        ))
+    return compact
+
+
+def concat_compact(frames: Sequence[pd.DataFrame]) -> pd.DataFrame:
+    """``pd.concat`` that keeps categorical columns categorical.
+
+    Categories are unioned per column before concatenating, so frames read
+    from different files (with different Machine_ID sets) still combine into
+    one categorical column instead of an object column.
+    """
+    frames = [frame for frame in frames if len(frame.columns)]
+    if not frames:
+        return pd.DataFrame()
+    categorical: List[str] = [
+        col for col in frames[0].columns
+        if all(col in f and isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames)
+    ]
+    if categorical and len(frames) > 1:
+        frames = [frame.copy(deep=False) for frame in frames]
+        for col in categorical:
+            categories = frames[0][col].cat.categories.append([f[col].cat.categories for f in frames[1:]]).unique()
+            for frame in frames:
+                frame[col] = frame[col].cat.set_categories(categories)
+    return pd.concat(frames, ignore_index=True)
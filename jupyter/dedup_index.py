@@ -0,0 +1,311 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Row-level deduplication index across overlapping factory reports
+# Developed using Python by Heider Jeffer
+#
+# Plants re-send corrected workbooks as new files, so the same production
+# record can arrive in several reports. The index decides, per record, which
+# version counts:
+#
+#   - Rows with a full record key (Date, Machine_ID and a Shift value) are
+#     the same record whichever file they come from; the version from the
+#     most recently modified file counts.
+#   - Without a Shift, (Date, Machine_ID) is not a record key: per-shift or
+#     per-line exports legitimately repeat it. Such rows only supersede rows
+#     of the same report lineage, i.e. the same file re-sent
+#     (report1.xlsx, report1_corrected.xlsx, report1 (2).csv, report1_v3.xlsx).
+#     Rows of different lineages are all counted; rows that match a counted
+#     row of another lineage exactly are reported as suspected duplicates.
+#
+# The n-th occurrence of a key within one file is part of its fingerprint, so
+# a corrected file replaces repeated rows one for one.
+#
+# On disk the index is partitioned by month of Date (every key lives in the
+# partition of its Date):
+#   <month>-counted-<gen>.parquet      the counted version per key
+#   <month>-superseded-<gen>.parquet   append-only log of versions a later
+#                                      retraction can bring back
+# A batch only opens the partitions of the months it touches. Files are
+# never rewritten in place: flush() writes new generations and the owner
+# commits the new file map (state()) atomically, then collect_garbage()
+# deletes files no map refers to any more.
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from report_ingestion import SOURCE_COLUMN
+
+try:
+    import pyarrow  # noqa: F401  (pandas' Parquet engine)
+    PART_SUFFIX = ".parquet"
+except ImportError:  # partitions fall back to pickle files without pyarrow
+    PART_SUFFIX = ".pkl"
+
+KEY_COLUMNS = ("Date", "Machine_ID", "Shift")
+KEY = "__row_key"  # record fingerprint; unique among counted rows
+LOOSE = "__loose_key"  # key columns + occurrence, without the lineage
+MATCH = "__match"  # loose key + values, for suspected duplicates
+VALUE = "__value_hash"
+LINEAGE = "__lineage"
+RANK = "__rank"
+_COLUMNS = [SOURCE_COLUMN, "Date", "Machine_ID", KEY, LOOSE, MATCH, VALUE, LINEAGE, RANK]
+
+# Re-send markers stripped from a file stem to find its lineage
+_RESEND_SUFFIX = re.compile(r"(([ _.-]+(v\d+|rev\d*|corrected|correction|resen[dt]|fixed|updated|copy))|(\s*\(\d+\)))+$",
+                            re.IGNORECASE)
+
+
+def source_lineage(path: str) -> str:
+    """Report a file is a version of: its directory and stem without re-send markers."""
+    directory, name = os.path.split(str(path))
+    stem = os.path.splitext(name)[0]
+    return os.path.join(directory, (_RESEND_SUFFIX.sub("", stem) or stem).lower())
+
+
+def _hashable(values: pd.Series) -> pd.Series:
+    """Dates are compared at one resolution; everything else as text (M1 == "M1", 2 == "2")."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype("datetime64[ns]")  # CSV/Parquet readers may return other units
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.rename_categories([str(c) for c in values.cat.categories]).astype(object)
+    return values.astype(str).where(values.notna())
+
+
+def _hash(frame: pd.DataFrame) -> np.ndarray:
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+def row_fingerprints(rows: pd.DataFrame, key_columns: Sequence[str] = KEY_COLUMNS) -> pd.DataFrame:
+    """KEY, LOOSE, MATCH, VALUE and LINEAGE columns for ``rows`` (tagged with their source file)."""
+    present = [col for col in key_columns if col in rows]
+    keys = pd.DataFrame({col: _hashable(rows[col]) for col in present}, index=rows.index)
+    keys["__occurrence"] = keys.groupby([rows[SOURCE_COLUMN], *[keys[col] for col in present]],
+                                        observed=True, dropna=False).cumcount()
+    codes, sources = pd.factorize(rows[SOURCE_COLUMN])
+    lineage = np.array([source_lineage(source) for source in sources], dtype=object)[codes]
+    record_key = np.ones(len(rows), dtype=bool) if len(present) == len(key_columns) else np.zeros(len(rows), bool)
+    for col in present:
+        record_key &= rows[col].notna().to_numpy()
+
+    loose = _hash(keys)
+    scoped = _hash(pd.DataFrame({"key": loose, "lineage": lineage}))
+    value_columns = [col for col in rows if col not in present and col != SOURCE_COLUMN]
+    value = _hash(pd.DataFrame({col: _hashable(rows[col]) for col in value_columns}, index=rows.index))
+    return pd.DataFrame({KEY: np.where(record_key, loose, scoped), LOOSE: loose,
+                         MATCH: _hash(pd.DataFrame({"key": loose, "value": value})),
+                         VALUE: value, LINEAGE: lineage}, index=rows.index)
+
+
+def _month_labels(dates: pd.Series) -> pd.Series:
+    """"YYYY-MM" partition label per row (formatted once per month, not per row)."""
+    codes = dates.dt.year * 100 + dates.dt.month
+    return codes.map({code: f"{code // 100:04d}-{code % 100:02d}" for code in codes.unique()})
+
+
+def _latest(versions: pd.DataFrame) -> pd.DataFrame:
+    """The newest version per key (highest rank, then source path), indexed by key."""
+    latest = versions.sort_values([RANK, SOURCE_COLUMN], kind="stable").drop_duplicates(KEY, keep="last")
+    return latest.set_axis(pd.Index(latest[KEY].to_numpy()), axis=0)
+
+
+def _write(frame: pd.DataFrame, path: str) -> None:
+    tmp_path = path + ".tmp"
+    if PART_SUFFIX == ".parquet":
+        frame.to_parquet(tmp_path, index=False)
+    else:
+        frame.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _read(path: str) -> pd.DataFrame:
+    return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_pickle(path)
+
+
+@dataclass
+class DedupChanges:
+    gained: pd.DataFrame  # rows that count from now on
+    lost: pd.DataFrame  # rows that no longer count (superseded or retracted)
+    superseded: int = 0  # counted rows replaced by a newer version of the same record
+    identical: int = 0  # of those, replacements carrying the same values
+    suspected: int = 0  # counted rows that exactly match a counted row of another report lineage
+
+    @classmethod
+    def merge(cls, parts: List["DedupChanges"], empty: pd.DataFrame) -> "DedupChanges":
+        def concat(frames):
+            frames = [frame for frame in frames if len(frame)]
+            return pd.concat(frames) if frames else empty
+        return cls(concat(part.gained for part in parts), concat(part.lost for part in parts),
+                   superseded=sum(part.superseded for part in parts),
+                   identical=sum(part.identical for part in parts),
+                   suspected=sum(part.suspected for part in parts))
+
+
+class DedupIndex:
+    """Counted record versions, plus the superseded ones, partitioned by month.
+
+    Args:
+        directory: Where the partition files live.
+        state: File map and source registry from a previous state() call.
+        key_columns: Columns that form a full record key.
+    """
+
+    def __init__(self, directory: str, state: Optional[dict] = None, key_columns: Sequence[str] = KEY_COLUMNS):
+        self.directory = directory
+        self.key_columns = tuple(key_columns)
+        state = state or {}
+        # month -> {"counted": file or None, "superseded": [files]}
+        self.files: Dict[str, dict] = {month: {"counted": entry["counted"], "superseded": list(entry["superseded"])}
+                                       for month, entry in state.get("files", {}).items()}
+        # source -> months holding any of its versions
+        self.sources: Dict[str, List[str]] = {source: list(months)
+                                              for source, months in state.get("sources", {}).items()}
+        self._counted: Dict[str, pd.DataFrame] = {}
+        self._appended: Dict[str, List[pd.DataFrame]] = {}  # new superseded rows per month
+        self._rewritten: Dict[str, pd.DataFrame] = {}  # compacted superseded log per month
+        self._dirty: set = set()
+
+    def state(self) -> dict:
+        return {"files": self.files, "sources": self.sources}
+
+    # --- Partitions ---
+    def _empty(self) -> pd.DataFrame:
+        dtypes = {"Date": "datetime64[ns]", KEY: "uint64", LOOSE: "uint64", MATCH: "uint64", VALUE: "uint64",
+                  RANK: "float64"}
+        return pd.DataFrame({col: pd.Series(dtype=dtypes.get(col, object)) for col in _COLUMNS})
+
+    def _entry(self, month: str) -> dict:
+        return self.files.setdefault(month, {"counted": None, "superseded": []})
+
+    def counted(self, month: str) -> pd.DataFrame:
+        """Counted versions of ``month``, indexed by record key (loaded once per run)."""
+        if month not in self._counted:
+            name = self._entry(month)["counted"]
+            frame = _read(os.path.join(self.directory, name)) if name else self._empty()
+            self._counted[month] = frame.set_axis(pd.Index(frame[KEY].to_numpy()), axis=0)
+        return self._counted[month]
+
+    def superseded(self, month: str) -> pd.DataFrame:
+        if month in self._rewritten:
+            frames = [self._rewritten[month]]
+        else:
+            frames = [_read(os.path.join(self.directory, name)) for name in self._entry(month)["superseded"]]
+        frames += self._appended.get(month, [])
+        return pd.concat(frames, ignore_index=True) if frames else self._empty()
+
+    # --- Updates ---
+    def add(self, rows: pd.DataFrame, ranks: Dict[str, float]) -> DedupChanges:
+        """Record ``rows`` (tagged with their source file); ``ranks`` orders the sources, newest highest.
+
+        Sources must not be in the index already; remove() them first.
+        """
+        if rows.empty:
+            return DedupChanges(self._empty(), self._empty())
+        rows = pd.concat([rows, row_fingerprints(rows, self.key_columns)], axis=1)
+        rows[RANK] = rows[SOURCE_COLUMN].map(ranks).astype("float64")
+        rows["Machine_ID"] = _hashable(rows["Machine_ID"])  # IDs arrive as text or numbers
+        rows = rows.drop(columns=[col for col in self.key_columns if col not in _COLUMNS], errors="ignore")
+        months = _month_labels(rows["Date"])
+        touched = pd.DataFrame({"source": rows[SOURCE_COLUMN].astype(str), "month": months}).drop_duplicates()
+        for source, month in touched.itertuples(index=False):
+            known = self.sources.setdefault(source, [])
+            if month not in known:
+                known.append(month)
+        return DedupChanges.merge([self._add_month(month, part) for month, part in rows.groupby(months, sort=False)],
+                                  self._empty())
+
+    def _add_month(self, month: str, rows: pd.DataFrame) -> DedupChanges:
+        counted = self.counted(month)
+        rows = rows.sort_values([RANK, SOURCE_COLUMN], kind="stable")
+        older = rows[KEY].duplicated(keep="last").to_numpy()  # several versions of a key in one batch
+        candidates = rows[~older].set_axis(pd.Index(rows[KEY].to_numpy()[~older]), axis=0)
+        outdated = [rows[older]]
+        position = counted.index.get_indexer(candidates.index)  # one hash probe per record
+        known = position >= 0
+        current = counted.iloc[position[known]]
+        rank, current_rank = candidates[RANK].to_numpy()[known], current[RANK].to_numpy()
+        newer = (rank > current_rank) | ((rank == current_rank) & (
+            candidates[SOURCE_COLUMN].to_numpy()[known] > current[SOURCE_COLUMN].to_numpy()))
+        wins = ~known
+        wins[known] = newer
+        lost, gained = current[newer], candidates[wins]
+        outdated += [lost, candidates[~wins]]
+        identical = int((candidates[VALUE].to_numpy()[known][newer] == lost[VALUE].to_numpy()).sum())
+
+        if len(lost):
+            counted = counted[~counted.index.isin(lost.index)]
+        counted = pd.concat([counted, gained]) if len(counted) else gained
+        # Newly counted rows whose key and values match another counted row can only come from another lineage
+        suspected = int((counted[MATCH].duplicated(keep="first") & counted.index.isin(gained.index[~known[wins]])).sum())
+        self._counted[month] = counted
+        self._append_superseded(month, pd.concat([frame for frame in outdated if len(frame)] or [self._empty()],
+                                                 ignore_index=True))
+        self._dirty.add(month)
+        return DedupChanges(gained, lost, superseded=len(lost), identical=identical, suspected=suspected)
+
+    def _append_superseded(self, month: str, rows: pd.DataFrame) -> None:
+        if len(rows):
+            self._appended.setdefault(month, []).append(rows.reset_index(drop=True))
+
+    def remove(self, sources: Iterable[str]) -> DedupChanges:
+        """Forget every version from ``sources``; the next-newest version of their records counts again.
+
+        Only the months the sources touched are opened.
+        """
+        sources = {str(source) for source in sources}
+        months = sorted({month for source in sources for month in self.sources.pop(source, [])})
+        parts = []
+        for month in months:
+            counted = self.counted(month)
+            retracted = counted[SOURCE_COLUMN].isin(sources).to_numpy()
+            lost = counted[retracted]
+            log = self.superseded(month)
+            log = log[~log[SOURCE_COLUMN].isin(sources)].reset_index(drop=True)
+            restored = _latest(log[log[KEY].isin(lost.index)].reset_index().rename(columns={"index": "__row"}))
+            log = log.drop(index=restored["__row"]).reset_index(drop=True)
+            restored = restored.drop(columns="__row")
+            self._counted[month] = pd.concat([counted[~retracted], restored])
+            self._rewritten[month] = log
+            self._appended.pop(month, None)
+            self._dirty.add(month)
+            parts.append(DedupChanges(restored, lost))
+        return DedupChanges.merge(parts, self._empty())
+
+    # --- Persistence ---
+    def flush(self, generation: int) -> None:
+        """Write the changed partitions as files of ``generation`` and point the file map at them."""
+        os.makedirs(self.directory, exist_ok=True)
+        for month in sorted(self._dirty):
+            entry = self._entry(month)
+            counted = self._counted[month]
+            entry["counted"] = None
+            if len(counted):
+                entry["counted"] = f"{month}-counted-{generation}{PART_SUFFIX}"
+                _write(counted.reset_index(drop=True), os.path.join(self.directory, entry["counted"]))
+            if month in self._rewritten:
+                entry["superseded"] = []
+                pending = [self._rewritten.pop(month)] + self._appended.pop(month, [])
+            else:
+                pending = self._appended.pop(month, [])
+            pending = [frame for frame in pending if len(frame)]
+            if pending:
+                name = f"{month}-superseded-{generation}{PART_SUFFIX}"
+                _write(pd.concat(pending, ignore_index=True), os.path.join(self.directory, name))
+                entry["superseded"].append(name)
+            if entry["counted"] is None and not entry["superseded"]:
+                del self.files[month]
+        self._dirty.clear()
+
+    def collect_garbage(self) -> int:
+        """Delete partition files the file map no longer refers to (old generations, crashed runs)."""
+        if not os.path.isdir(self.directory):
+            return 0
+        referenced = {name for entry in self.files.values() for name in [entry["counted"], *entry["superseded"]]}
+        removed = 0
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name not in referenced:
+                os.remove(entry.path)
+                removed += 1
+        return removed
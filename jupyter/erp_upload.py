@@ -0,0 +1,460 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Asynchronous, checksummed ERP upload queue
+# Developed using Python by Heider Jeffer
+#
+# Replaces the synchronous shutil copy of the RPA upload step. Reports are
+# put on a persistent queue (upload_queue/queue.json), so an upload that
+# fails or is interrupted is picked up again by the next batch run. The queue
+# is drained by asyncio workers with bounded concurrency. A failed transfer
+# is rescheduled with exponential backoff (next_attempt in the queue file);
+# short waits are retried within the run, longer ones are left to later runs
+# instead of holding up the batch, so an ERP outage delays uploads but never
+# drops them.
+#
+# Transfers are chunked and resumable: the target keeps a partial file per
+# content hash and reports how many bytes it already holds, and the upload
+# continues from there. A report whose sha256 matches what the target already
+# holds is skipped without sending anything.
+#
+# Two targets speak the same small protocol:
+#   DirectoryTarget  a local directory (default: upload_area/ERP)
+#   HttpTarget       an HTTP endpoint; StandInServer is a local stand-in
+#                    that stores into a directory, for offline testing
+#
+# Usage (from the jupyter directory):
+#   python erp_upload.py serve --port 8765            # local ERP stand-in
+#   python erp_upload.py drain --url http://127.0.0.1:8765
+#   python erp_upload.py enqueue automated_reports/summary_report_*.xlsx
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("erp_upload")
+
+QUEUE_VERSION = 1
+DEFAULT_QUEUE_PATH = os.path.join("upload_queue", "queue.json")
+DEFAULT_TARGET_DIR = os.path.join("upload_area", "ERP")
+CHUNK_SIZE = 1 << 20
+MAX_CONCURRENCY = 4
+RETRY_WITHIN_SECONDS = 2.0  # longer backoffs are left to the next run
+BACKOFF_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 900.0
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class TransferError(Exception):
+    """A chunk was rejected or the target is unreachable; the job is retried."""
+
+
+class StaleJobError(TransferError):
+    """The queued report vanished or changed; the job is not retried (a new enqueue takes over)."""
+
+
+# =========================
+# --- Targets -------------
+# =========================
+class DirectoryTarget:
+    """ERP target backed by a local directory.
+
+    Complete files carry a ``<name>.sha256`` sidecar; partial uploads are
+    kept as ``.<name>.<sha256[:16]>.part`` until the last chunk arrives and
+    the file is renamed into place.
+    """
+
+    def __init__(self, root: str = DEFAULT_TARGET_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return self.root
+
+    def _paths(self, name: str, sha256: str) -> Tuple[str, str, str]:
+        name = os.path.basename(name)
+        return (os.path.join(self.root, name), os.path.join(self.root, f"{name}.sha256"),
+                os.path.join(self.root, f".{name}.{sha256[:16]}.part"))
+
+    def stored_sha256(self, name: str) -> Optional[str]:
+        path, sidecar, _ = self._paths(name, "")
+        if not os.path.exists(path):
+            return None
+        if os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(path):
+            with open(sidecar, encoding="utf-8") as fh:
+                return fh.read().strip()
+        return file_sha256(path)  # placed by something else, e.g. the old shutil copy
+
+    # Blocking protocol; the async methods below run it in a thread
+    def status_sync(self, name: str, sha256: str) -> Tuple[Optional[str], int]:
+        _, _, part = self._paths(name, sha256)
+        return self.stored_sha256(name), os.path.getsize(part) if os.path.exists(part) else 0
+
+    def write_sync(self, name: str, sha256: str, offset: int, data: bytes, total: int) -> int:
+        path, sidecar, part = self._paths(name, sha256)
+        with self._lock:
+            received = os.path.getsize(part) if os.path.exists(part) else 0
+            if offset != received:
+                raise TransferError(f"{name}: chunk at {offset} but target holds {received} bytes")
+            with open(part, "ab") as fh:
+                fh.write(data)
+                fh.flush()
+                os.fsync(fh.fileno())
+            received += len(data)
+            if received < total:
+                return received
+            if file_sha256(part) != sha256:
+                os.remove(part)
+                raise TransferError(f"{name}: checksum mismatch after upload, restarting")
+            os.replace(part, path)
+            with open(sidecar + ".tmp", "w", encoding="utf-8") as fh:
+                fh.write(sha256)
+            os.replace(sidecar + ".tmp", sidecar)
+            self._discard_partials(name)
+            return received
+
+    def _discard_partials(self, name: str) -> None:
+        """Drop partial uploads of earlier versions of ``name``; the complete file supersedes them."""
+        for stale in glob.glob(os.path.join(glob.escape(self.root), f".{glob.escape(os.path.basename(name))}.*.part")):
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+    async def status(self, name: str, sha256: str) -> Tuple[Optional[str], int]:
+        return await asyncio.to_thread(self.status_sync, name, sha256)
+
+    async def write(self, name: str, sha256: str, offset: int, data: bytes, total: int) -> int:
+        return await asyncio.to_thread(self.write_sync, name, sha256, offset, data, total)
+
+
+class HttpTarget:
+    """ERP target reached over HTTP.
+
+    ``HEAD /<name>`` answers ``X-Stored-SHA256`` for the complete file and
+    ``X-Received-Bytes`` for the partial upload of the ``X-Content-SHA256``
+    sent in the request; ``PUT /<name>`` appends one chunk given by ``Content-Range``.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def __str__(self) -> str:
+        return self.base_url
+
+    def _request(self, method: str, name: str, headers: Dict[str, str], data: Optional[bytes] = None):
+        url = f"{self.base_url}/{urllib.parse.quote(os.path.basename(name))}"
+        request = urllib.request.Request(url, data=data, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.headers
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.headers
+        except OSError as exc:
+            raise TransferError(f"{url}: {exc}") from exc
+
+    def status_sync(self, name: str, sha256: str) -> Tuple[Optional[str], int]:
+        code, headers = self._request("HEAD", name, {"X-Content-SHA256": sha256})
+        if code >= 500:
+            raise TransferError(f"{name}: HEAD returned {code}")
+        return headers.get("X-Stored-SHA256") or None, int(headers.get("X-Received-Bytes", 0))
+
+    def write_sync(self, name: str, sha256: str, offset: int, data: bytes, total: int) -> int:
+        headers = {
+            "Content-Range": f"bytes {offset}-{offset + len(data) - 1}/{total}",
+            "X-Content-SHA256": sha256,
+            "Content-Type": "application/octet-stream",
+        }
+        code, response = self._request("PUT", name, headers, data)
+        if code not in (200, 201, 202, 204):
+            raise TransferError(f"{name}: PUT returned {code}")
+        return int(response.get("X-Received-Bytes", offset + len(data)))
+
+    async def status(self, name: str, sha256: str) -> Tuple[Optional[str], int]:
+        return await asyncio.to_thread(self.status_sync, name, sha256)
+
+    async def write(self, name: str, sha256: str, offset: int, data: bytes, total: int) -> int:
+        return await asyncio.to_thread(self.write_sync, name, sha256, offset, data, total)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local HTTP stand-in for the ERP endpoint, storing uploads through a DirectoryTarget."""
+
+    def __init__(self, address: Tuple[str, int] = ("127.0.0.1", 0), root: str = DEFAULT_TARGET_DIR):
+        self.target = DirectoryTarget(root)
+        super().__init__(address, _StandInHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+
+    def _name(self) -> str:
+        return os.path.basename(urllib.parse.unquote(urllib.parse.urlparse(self.path).path))
+
+    def _reply(self, code: int, headers: Dict[str, str]) -> None:
+        self.send_response(code)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_HEAD(self) -> None:
+        stored, received = self.server.target.status_sync(self._name(), self.headers.get("X-Content-SHA256", ""))
+        headers = {"X-Received-Bytes": str(received)}
+        if stored:
+            headers["X-Stored-SHA256"] = stored
+        self._reply(200 if stored else 404, headers)
+
+    def do_PUT(self) -> None:
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            span, total = self.headers["Content-Range"].split()[1].split("/")
+            offset = int(span.split("-")[0])
+            received = self.server.target.write_sync(self._name(), self.headers["X-Content-SHA256"], offset,
+                                                     data, int(total))
+        except TransferError:
+            _, received = self.server.target.status_sync(self._name(), self.headers.get("X-Content-SHA256", ""))
+            self._reply(409, {"X-Received-Bytes": str(received)})
+            return
+        except (KeyError, ValueError, IndexError):
+            self._reply(400, {})
+            return
+        self._reply(201 if received >= int(total) else 202, {"X-Received-Bytes": str(received)})
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("stand-in: " + format, *args)
+
+
+# =========================
+# --- Persistent Queue ----
+# =========================
+@dataclass
+class UploadJob:
+    path: str
+    sha256: str
+    size: int
+    status: str = "pending"  # pending (incl. waiting for a retry) | done | skipped | failed (report gone or changed)
+    attempts: int = 0
+    next_attempt: float = 0.0
+    last_error: str = ""
+
+
+class UploadQueue:
+    """Upload jobs kept in a JSON file, keyed by report path and content hash."""
+
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH):
+        self.path = path
+        self.jobs: List[UploadJob] = self.load()
+
+    def load(self) -> List[UploadJob]:
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding="utf-8") as fh:
+            payload = json.load(fh)
+        if payload.get("version") != QUEUE_VERSION:
+            return []
+        return [UploadJob(**job) for job in payload["jobs"]]
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        payload = {"version": QUEUE_VERSION, "jobs": [asdict(job) for job in self.jobs]}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def enqueue(self, report: str) -> UploadJob:
+        """Queue ``report``; an older unfinished version of the same path is replaced."""
+        sha256 = file_sha256(report)
+        for job in self.jobs:
+            if job.path == report and job.sha256 == sha256:
+                if job.status == "failed":  # the report is back
+                    job.status, job.attempts, job.next_attempt = "pending", 0, 0.0
+                    self.save()
+                return job
+        self.jobs = [job for job in self.jobs if not (job.path == report and job.status in ("pending", "failed"))]
+        job = UploadJob(report, sha256, os.path.getsize(report))
+        self.jobs.append(job)
+        self.save()
+        return job
+
+    def pending(self) -> List[UploadJob]:
+        return [job for job in self.jobs if job.status == "pending"]
+
+    def due(self, until: float) -> List[UploadJob]:
+        """Pending jobs whose next attempt is at or before ``until``."""
+        return [job for job in self.pending() if job.next_attempt <= until]
+
+    def prune(self, keep_finished: int = 100) -> None:
+        """Forget all but the newest ``keep_finished`` finished jobs."""
+        finished = [job for job in self.jobs if job.status != "pending"]
+        drop = {id(job) for job in finished[:-keep_finished]} if len(finished) > keep_finished else set()
+        self.jobs = [job for job in self.jobs if id(job) not in drop]
+
+
+# =========================
+# --- Uploader ------------
+# =========================
+class ErpUploader:
+    """Drain an UploadQueue into ``target`` with bounded concurrency and retries.
+
+    Args:
+        target: DirectoryTarget or HttpTarget.
+        queue: Persistent job queue.
+        max_concurrency: Transfers in flight at once.
+        retry_within: Retries due within this many seconds are waited for in
+            this run; later ones stay queued for the next run.
+        backoff: Base delay; attempt n waits about ``backoff * 2**(n-1)`` seconds.
+        chunk_size: Bytes sent per request.
+    """
+
+    def __init__(self, target, queue: UploadQueue, max_concurrency: int = MAX_CONCURRENCY,
+                 retry_within: float = RETRY_WITHIN_SECONDS, backoff: float = BACKOFF_SECONDS,
+                 chunk_size: int = CHUNK_SIZE):
+        self.target = target
+        self.queue = queue
+        self.max_concurrency = max_concurrency
+        self.retry_within = retry_within
+        self.backoff = backoff
+        self.chunk_size = chunk_size
+
+    async def transfer(self, job: UploadJob) -> str:
+        """Upload one report, resuming where the target left off; returns the final status."""
+        name = os.path.basename(job.path)
+        stored, received = await self.target.status(name, job.sha256)
+        if stored == job.sha256:
+            logger.info("ERP already holds %s (sha256 %s...), skipped", name, job.sha256[:12])
+            return "skipped"
+        if not os.path.exists(job.path):
+            raise StaleJobError(f"{job.path} no longer exists")
+        if file_sha256(job.path) != job.sha256:
+            raise StaleJobError(f"{job.path} changed after it was queued")
+        if received:
+            logger.info("Resuming %s at %d of %d bytes", name, received, job.size)
+        with open(job.path, "rb") as fh:
+            while received < job.size:
+                fh.seek(received)
+                chunk = await asyncio.to_thread(fh.read, self.chunk_size)
+                received = await self.target.write(name, job.sha256, received, chunk, job.size)
+        if job.size == 0:
+            await self.target.write(name, job.sha256, 0, b"", 0)
+        logger.info("Uploaded %s to %s (%d bytes)", name, self.target, job.size)
+        return "done"
+
+    async def _worker(self, jobs: "asyncio.Queue[UploadJob]", save_lock: asyncio.Lock) -> None:
+        while True:
+            try:
+                job = jobs.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            while job.status == "pending":
+                delay = job.next_attempt - time.time()
+                if delay > self.retry_within:
+                    break  # stays queued; a later run picks it up
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                job.attempts += 1
+                try:
+                    job.status = await self.transfer(job)
+                    job.last_error, job.next_attempt = "", 0.0
+                except StaleJobError as exc:
+                    job.status, job.last_error = "failed", str(exc)
+                    logger.error("Upload of %s abandoned: %s", job.path, exc)
+                except (TransferError, OSError) as exc:
+                    job.last_error = str(exc)
+                    wait = min(BACKOFF_MAX_SECONDS, self.backoff * 2 ** (job.attempts - 1))
+                    job.next_attempt = time.time() + wait * random.uniform(0.5, 1.0)
+                    logger.warning("Upload of %s failed (attempt %d), next attempt in %.1fs: %s",
+                                   job.path, job.attempts, job.next_attempt - time.time(), exc)
+                async with save_lock:
+                    self.queue.save()
+
+    async def drain(self) -> Dict[str, int]:
+        """Process the pending jobs that are due; returns counts by status ("pending": still queued)."""
+        pending = self.queue.pending()
+        due = self.queue.due(time.time() + self.retry_within)
+        jobs: "asyncio.Queue[UploadJob]" = asyncio.Queue()
+        for job in due:
+            jobs.put_nowait(job)
+        save_lock = asyncio.Lock()
+        workers = [asyncio.create_task(self._worker(jobs, save_lock))
+                   for _ in range(min(self.max_concurrency, len(due)))]
+        await asyncio.gather(*workers)
+        self.queue.prune()
+        self.queue.save()
+        counts: Dict[str, int] = {}
+        for job in pending:
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return counts
+
+
+def make_target(url: Optional[str] = None, directory: str = DEFAULT_TARGET_DIR):
+    """HttpTarget for ``url``, else a DirectoryTarget on ``directory``."""
+    return HttpTarget(url) if url else DirectoryTarget(directory)
+
+
+def upload_reports(reports: List[str], target=None, queue_path: str = DEFAULT_QUEUE_PATH,
+                   **options) -> Dict[str, int]:
+    """Queue ``reports`` and drain the queue (earlier unfinished jobs included)."""
+    queue = UploadQueue(queue_path)
+    for report in reports:
+        queue.enqueue(report)
+    uploader = ErpUploader(target if target is not None else make_target(), queue, **options)
+    return asyncio.run(uploader.drain())
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="ERP upload queue")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the local HTTP ERP stand-in")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--root", default=DEFAULT_TARGET_DIR)
+    for name in ("enqueue", "drain"):
+        command = commands.add_parser(name, help=f"{name} reports")
+        command.add_argument("reports", nargs="*" if name == "drain" else "+")
+        command.add_argument("--url", help="HTTP target (default: the upload_area/ERP directory)")
+        command.add_argument("--queue", default=DEFAULT_QUEUE_PATH)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.command == "serve":
+        server = StandInServer(("127.0.0.1", args.port), args.root)
+        logger.info("ERP stand-in listening on %s, storing into %s", server.url, args.root)
+        server.serve_forever()
+    reports = sorted({path for pattern in args.reports for path in glob.glob(pattern)})
+    if args.command == "enqueue":
+        queue = UploadQueue(args.queue)
+        for report in reports:
+            queue.enqueue(report)
+        logger.info("%d job(s) pending", len(queue.pending()))
+    else:
+        logger.info("Upload result: %s", upload_reports(reports, make_target(args.url), args.queue))
+
+
+if __name__ == "__main__":
+    main()
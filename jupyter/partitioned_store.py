@@ -0,0 +1,229 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Date-partitioned on-disk store for production history
+# Developed using Python by Heider Jeffer
+#
+# Production rows are written once, at ingestion time, into
+#
+#   production_store/site=<site>/year=YYYY/month=MM/day=DD/part-<source>.parquet
+#
+# (one file per source workbook and day, so a replaced workbook is retracted
+# by deleting its files). A small JSON index keeps, per partition file, the
+# site, day, source, row count, Production_Units min/max and the Machine_IDs
+# present. Queries such as "machine M2 last week" prune on that index and only
+# open the matching partitions instead of re-reading every factory workbook.
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from compact_types import concat_compact
+from report_ingestion import SOURCE_COLUMN, IngestResult
+
+try:
+    import pyarrow  # noqa: F401  (pandas' Parquet engine)
+    PART_SUFFIX = ".parquet"
+except ImportError:  # partitions fall back to pickle files without pyarrow
+    PART_SUFFIX = ".pkl"
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DEFAULT_STORE_DIR = "production_store"
+DEFAULT_SITE = "main"
+SITE_COLUMN = "Site"
+
+
+@dataclass(frozen=True)
+class Partition:
+    path: str  # relative to the store root
+    site: str
+    day: str  # ISO date
+    source: str
+    rows: int
+    units_min: Optional[float]
+    units_max: Optional[float]
+    machines: tuple
+
+    def matches(self, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp],
+                machines: Optional[set], sites: Optional[set]) -> bool:
+        day = pd.Timestamp(self.day)
+        if start is not None and day < start.normalize():
+            return False
+        if end is not None and day > end:
+            return False
+        if sites is not None and self.site not in sites:
+            return False
+        return machines is None or not machines.isdisjoint(self.machines)
+
+
+def _write_part(frame: pd.DataFrame, path: str) -> None:
+    tmp_path = path + ".tmp"
+    if PART_SUFFIX == ".parquet":
+        frame.to_parquet(tmp_path, index=False)
+    else:
+        frame.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _read_part(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=columns)
+    frame = pd.read_pickle(path)
+    return frame[columns] if columns is not None else frame
+
+
+class PartitionedStore:
+    """Production rows partitioned by site and day, with a min/max index.
+
+    Args:
+        root: Store directory.
+        site: Site name used for rows without a ``Site`` column.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, site: str = DEFAULT_SITE):
+        self.root = root
+        self.site = site
+        self.index_path = os.path.join(root, "_index.json")
+        self.index: List[Partition] = self.load_index()
+
+    # --- Index ---
+    def load_index(self) -> List[Partition]:
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, encoding="utf-8") as fh:
+            payload = json.load(fh)
+        if payload.get("version") != INDEX_VERSION:
+            return []
+        return [Partition(**{**entry, "machines": tuple(entry["machines"])}) for entry in payload["partitions"]]
+
+    def save_index(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        payload = {"version": INDEX_VERSION, "partitions": [asdict(p) for p in self.index]}
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh)
+        os.replace(tmp_path, self.index_path)
+
+    @property
+    def sources(self) -> set:
+        return {p.source for p in self.index}
+
+    def date_range(self):
+        """(first day, last day) held by the store, or (None, None) when empty."""
+        if not self.index:
+            return None, None
+        days = [p.day for p in self.index]
+        return pd.Timestamp(min(days)), pd.Timestamp(max(days))
+
+    def machines(self) -> List[str]:
+        return sorted({m for p in self.index for m in p.machines})
+
+    # --- Writing ---
+    def remove_source(self, source: str) -> int:
+        """Delete every partition file written for ``source``."""
+        keep, dropped = [], 0
+        for partition in self.index:
+            if partition.source != source:
+                keep.append(partition)
+                continue
+            try:
+                os.remove(os.path.join(self.root, partition.path))
+            except FileNotFoundError:
+                pass
+            dropped += 1
+        self.index = keep
+        return dropped
+
+    def write_source(self, frame: pd.DataFrame, source: str) -> int:
+        """Replace the partitions of ``source`` with the rows of ``frame``."""
+        self.remove_source(source)
+        frame = frame.drop(columns=[SOURCE_COLUMN], errors="ignore")
+        dates = pd.to_datetime(frame["Date"], errors="coerce")
+        undated = int(dates.isna().sum())
+        if undated:
+            logger.warning("Skipped %d row(s) without a valid Date from %s", undated, source)
+        frame = frame.assign(Date=dates)[dates.notna()]
+        sites = frame[SITE_COLUMN] if SITE_COLUMN in frame else pd.Series(self.site, index=frame.index)
+        tag = hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+        written = 0
+        for (site, day), part in frame.groupby([sites.astype(str), frame["Date"].dt.normalize()], sort=False):
+            rel_dir = os.path.join(f"site={site}", f"year={day.year:04d}", f"month={day.month:02d}",
+                                   f"day={day.day:02d}")
+            os.makedirs(os.path.join(self.root, rel_dir), exist_ok=True)
+            rel_path = os.path.join(rel_dir, f"part-{tag}{PART_SUFFIX}")
+            _write_part(part.reset_index(drop=True), os.path.join(self.root, rel_path))
+            units = pd.to_numeric(part["Production_Units"], errors="coerce")
+            self.index.append(Partition(
+                path=rel_path,
+                site=site,
+                day=day.date().isoformat(),
+                source=source,
+                rows=len(part),
+                units_min=None if units.isna().all() else float(units.min()),
+                units_max=None if units.isna().all() else float(units.max()),
+                machines=tuple(sorted(map(str, part["Machine_ID"].dropna().unique()))),
+            ))
+            written += len(part)
+        return written
+
+    def sync(self, result: IngestResult) -> int:
+        """Partition the rows of new or changed workbooks and drop removed ones."""
+        files = set(result.files)
+        for source in (set(result.changed) | set(result.removed) | (self.sources - files)):
+            self.remove_source(source)
+        missing = files - self.sources
+        written = 0
+        if missing:
+            fresh = set(result.new) | set(result.changed)
+            rows = result.delta if result.delta is not None and missing <= fresh else result.data
+            if not rows.empty:
+                rows = rows[rows[SOURCE_COLUMN].isin(missing)]
+                for source, frame in rows.groupby(SOURCE_COLUMN, observed=True, sort=False):
+                    written += self.write_source(frame, str(source))
+        self.save_index()
+        logger.info("Partitioned %d row(s) from %d file(s); store holds %d partition(s)",
+                    written, len(missing), len(self.index))
+        return written
+
+    # --- Queries ---
+    def partitions(self, start=None, end=None, machines: Optional[Iterable[str]] = None,
+                   sites: Optional[Iterable[str]] = None) -> List[Partition]:
+        """Index entries that can hold rows matching the filters (no file is opened)."""
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        machines = {str(m) for m in machines} if machines is not None else None
+        sites = set(sites) if sites is not None else None
+        return [p for p in self.index if p.matches(start, end, machines, sites)]
+
+    def query(self, start=None, end=None, machines: Optional[Iterable[str]] = None,
+              sites: Optional[Iterable[str]] = None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Rows with ``start <= Date <= end`` (either bound optional) for the given machines/sites."""
+        machines = list(machines) if machines is not None else None
+        selected = self.partitions(start, end, machines, sites)
+        read_columns = None
+        if columns is not None:
+            read_columns = list(dict.fromkeys([*columns, "Date", "Machine_ID"]))
+        frames = []
+        for partition in selected:
+            frame = _read_part(os.path.join(self.root, partition.path), read_columns)
+            if SITE_COLUMN not in frame:
+                frame[SITE_COLUMN] = partition.site
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=list(columns) if columns is not None else ["Date", "Production_Units",
+                                                                                   "Machine_ID", SITE_COLUMN])
+        data = concat_compact(frames)
+        mask = pd.Series(True, index=data.index)
+        if start is not None:
+            mask &= data["Date"] >= pd.Timestamp(start)
+        if end is not None:
+            mask &= data["Date"] <= pd.Timestamp(end)
+        if machines is not None:
+            mask &= data["Machine_ID"].astype(str).isin({str(m) for m in machines})
+        data = data[mask].sort_values("Date", kind="stable").reset_index(drop=True)
+        logger.info("Query read %d of %d partition(s), returned %d row(s)", len(selected), len(self.index), len(data))
+        return data[list(columns)] if columns is not None else data
@@ -6,12 +6,25 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import datetime
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import List
 from io import BytesIO
 import numpy as np
 
+# Shared batch modules live one level up in jupyter/
+JUPYTER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, JUPYTER_DIR)
+from columnar_cache import read_bytes_cached
+from report_readers import REPORT_COLUMNS, supported_extensions
+from partitioned_store import PartitionedStore
+
 sns.set(style="whitegrid")
 
+UPLOAD_WORKERS = min(4, os.cpu_count() or 1)
+
 # =========================
 # ----- Metric Functions ---
 # =========================
@@ -43,6 +56,54 @@ def calculate_rpa_roi(costs: dict, benefits: dict) -> float:
     roi_value = ((total_benefits - total_costs) / total_costs) * 100
     return roi_value
 
+# =========================
+# --- Upload Parsing ------
+# =========================
+
+@st.cache_resource
+def get_upload_pool() -> ProcessPoolExecutor:
+    # One pool per server process, reused across reruns and sessions
+    return ProcessPoolExecutor(max_workers=UPLOAD_WORKERS)
+
+def parse_uploaded_files(uploaded_files) -> List[pd.DataFrame]:
+    """Parse the uploaded reports, only the ones not seen before, in parallel.
+
+    Parsed frames are kept in the session keyed by the sha256 of the file
+    bytes, so reruns (e.g. after a slider change) do not parse anything.
+    Each file is read by the reader registered for its extension (Excel,
+    CSV or Parquet), projected to the report columns.
+    """
+    parsed = st.session_state.setdefault("parsed_uploads", {})
+    keys, pending = [], {}
+    for file in uploaded_files:
+        data = file.getvalue()
+        key = hashlib.sha256(data).hexdigest()
+        keys.append(key)
+        if key not in parsed:
+            pending[key] = (file.name, data)
+
+    if pending:
+        progress = st.progress(0.0, text=f"Parsing {len(pending)} file(s)...")
+        if len(pending) == 1:
+            key, (name, data) = next(iter(pending.items()))
+            jobs = [(key, name, lambda: read_bytes_cached(data, key, name=name, columns=REPORT_COLUMNS))]
+        else:
+            pool = get_upload_pool()
+            futures = {pool.submit(read_bytes_cached, data, key, name=name, columns=REPORT_COLUMNS): (key, name)
+                       for key, (name, data) in pending.items()}
+            jobs = ((*futures[future], future.result) for future in as_completed(futures))
+        for done, (key, name, result) in enumerate(jobs, 1):
+            try:
+                parsed[key] = result()
+            except Exception as exc:
+                st.error(f"Could not parse {name}: {exc}")
+            progress.progress(done / len(pending), text=f"Parsed {name} ({done}/{len(pending)})")
+        progress.empty()
+
+    for key in set(parsed) - set(keys):  # forget files that were removed from the uploader
+        del parsed[key]
+    return [parsed[key] for key in keys if key in parsed]
+
 # =========================
 # --- Sidebar Navigation ---
 # =========================
@@ -160,7 +221,7 @@ elif menu == "RPA ROI Calculator":
 elif menu == "Automated Reports":
     st.title("Siemens Energy Automated Production Reports - By Heider Jeffer")
     st.markdown("""
-Upload multiple factory Excel reports. The system will:
+Upload multiple factory reports (Excel, CSV or Parquet). The system will:
 - Combine all files  
 - Clean and normalize data  
 - Summarize production units per day  
@@ -168,11 +229,15 @@ Upload multiple factory Excel reports. The system will:
 - Allow downloading the summary report
 """)
     
-    uploaded_files = st.file_uploader("Upload Excel files", type="xlsx", accept_multiple_files=True)
+    uploaded_files = st.file_uploader("Upload factory reports",
+                                      type=[ext.lstrip(".") for ext in supported_extensions()],
+                                      accept_multiple_files=True)
     
     if uploaded_files:
         st.success(f"{len(uploaded_files)} file(s) uploaded successfully!")
-        df_list = [pd.read_excel(file) for file in uploaded_files]
+        df_list = parse_uploaded_files(uploaded_files)
+        if not df_list:
+            st.stop()
         df = pd.concat(df_list, ignore_index=True)
         df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
         df = df.dropna(subset=['Production_Units'])
@@ -220,7 +285,28 @@ Upload multiple factory Excel reports. The system will:
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
     else:
-        st.info("Upload one or more Excel files to start processing.")
+        st.info("Upload one or more factory reports to start processing.")
+
+    # Production history written by the batch pipeline; queries only open the
+    # date/site partitions that match the selected range and machines
+    history = PartitionedStore(os.path.join(JUPYTER_DIR, "production_store"))
+    first_day, last_day = history.date_range()
+    if first_day is not None:
+        st.subheader("Production History")
+        default_start = max(first_day, last_day - pd.Timedelta(days=6))
+        selected_days = st.date_input("Date range", (default_start.date(), last_day.date()),
+                                      min_value=first_day.date(), max_value=last_day.date())
+        selected_machines = st.multiselect("Machine_ID (empty = all)", history.machines())
+        if len(selected_days) == 2:
+            start_day, end_day = (pd.Timestamp(d) for d in selected_days)
+            machines = selected_machines or None
+            n_partitions = len(history.partitions(start_day, end_day, machines))
+            history_df = history.query(start_day, end_day, machines)
+            st.caption(f"Read {n_partitions} of {len(history.index)} partitions, {len(history_df):,} rows")
+            if not history_df.empty:
+                daily = history_df.pivot_table(index='Date', columns='Machine_ID', values='Production_Units',
+                                               aggfunc='sum', observed=True)
+                st.line_chart(daily)
 
 # =========================
 # --- KPI Comparison Section ---
@@ -0,0 +1,341 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Declarative, vectorized data-quality rules for production records
+# Developed using Python by Heider Jeffer
+#
+# Data quality used to be a single `Production_Units < 0` check, with the
+# N_errors that data_quality(N_errors, N_total) needs counted by hand. Here
+# the checks are declared as a list of rules:
+#
+#   NotNull("Date"), InRange("Date", "2000-01-01", "now"),
+#   NotNull("Production_Units"), NonNegative("Production_Units"),
+#   Matches("Machine_ID", r"M\d+")  (or IsIn("Machine_ID", known_ids)),
+#   UniqueKey(("Date", "Machine_ID", "Shift")), Outlier("Production_Units", k=4)
+#
+# UniqueKey uses the dedup index's notion of a record (dedup_index.py): only a
+# full Date/Machine_ID/Shift key identifies one, and a key repeated within one
+# file is an error. Repeats across files are re-sends or later versions that
+# the index supersedes, and reports without a Shift column have no record key.
+#
+# Every rule turns into one boolean violation mask per chunk. Each column is
+# parsed once per chunk and shared by all rules that read it, the masks are
+# stacked into a (rows x rules) matrix, and per-file counts come from a single
+# grouped sum over that matrix. The resulting error-row counts feed straight
+# into data_quality (Live_Web_App/metrics.py) per file and for the dataset.
+import importlib.util
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from dedup_index import KEY_COLUMNS
+from report_ingestion import SOURCE_COLUMN
+
+METRICS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Live_Web_App", "metrics.py")
+
+
+def _load_metrics():
+    """The dashboard's metric kernels, loaded from their file under a name that cannot shadow anything."""
+    spec = importlib.util.spec_from_file_location("live_web_app_metrics", METRICS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+data_quality_vec = _load_metrics().data_quality_vec
+
+DATASET = "<dataset>"
+MACHINE_ID_PATTERN = r"M\d+"
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+class ChunkView:
+    """One chunk with each column parsed at most once (as dates, numbers or strings).
+
+    ``source`` is the file the whole chunk came from, when it is not tagged per row.
+    """
+
+    def __init__(self, chunk: pd.DataFrame, source: Optional[str] = None):
+        self.chunk = chunk
+        self.source = source
+        self._parsed: Dict[tuple, pd.Series] = {}
+
+    def __len__(self) -> int:
+        return len(self.chunk)
+
+    def _parse(self, kind: str, column: str, parse) -> pd.Series:
+        key = (kind, column)
+        if key not in self._parsed:
+            values = self.chunk[column] if column in self.chunk else pd.Series(np.nan, index=self.chunk.index)
+            self._parsed[key] = parse(values)
+        return self._parsed[key]
+
+    def raw(self, column: str) -> pd.Series:
+        return self._parse("raw", column, lambda values: values)
+
+    def dates(self, column: str) -> pd.Series:
+        return self._parse("date", column, _as_dates)
+
+    def numbers(self, column: str) -> pd.Series:
+        # float64 so missing values are NaN (never compare true) rather than pd.NA
+        return self._parse("number", column, lambda values: pd.to_numeric(values, errors="coerce").astype("float64"))
+
+    def strings(self, column: str) -> pd.Series:
+        """The column as a categorical of strings, so string rules run once per distinct value."""
+        return self._parse("string", column, _as_string_categorical)
+
+
+def _as_dates(values: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, errors="coerce")
+
+
+def _as_string_categorical(values: pd.Series) -> pd.Series:
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype("category")
+    categories = values.cat.categories
+    if not pd.api.types.is_string_dtype(categories):
+        values = values.cat.rename_categories([str(c) for c in categories])
+    return values
+
+
+def _per_category(values: pd.Series, test) -> np.ndarray:
+    """Evaluate ``test`` on the categories of ``values`` and broadcast it to the rows (False for missing)."""
+    codes = values.cat.codes.to_numpy()
+    flags = np.append(np.asarray(test(values.cat.categories), dtype=bool), False)
+    return flags[codes]  # code -1 (missing) picks the trailing False
+
+
+# =========================
+# --- Rules ---------------
+# =========================
+@dataclass(frozen=True)
+class NotNull:
+    column: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.column}_missing"
+
+    def mask(self, view: ChunkView, state: dict) -> np.ndarray:
+        return view.raw(self.column).isna().to_numpy()
+
+
+@dataclass(frozen=True)
+class NonNegative:
+    column: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.column}_negative"
+
+    def mask(self, view: ChunkView, state: dict) -> np.ndarray:
+        return (view.numbers(self.column) < 0).to_numpy()
+
+
+@dataclass(frozen=True)
+class InRange:
+    """Values outside [low, high]; bounds may be anything pd.Timestamp or float accepts ("now", "2000-01-01")."""
+    column: str
+    low: object = None
+    high: object = None
+    dates: bool = True
+
+    @property
+    def name(self) -> str:
+        return f"{self.column}_out_of_range"
+
+    def mask(self, view: ChunkView, state: dict) -> np.ndarray:
+        values = view.dates(self.column) if self.dates else view.numbers(self.column)
+        bound = pd.Timestamp if self.dates else float
+        outside = pd.Series(False, index=values.index)
+        if self.low is not None:
+            outside |= values < bound(self.low)
+        if self.high is not None:
+            outside |= values > bound(self.high)
+        # Values that do not parse at all count as out of range unless they were empty
+        outside |= values.isna() & view.raw(self.column).notna()
+        return outside.to_numpy()
+
+
+@dataclass(frozen=True)
+class IsIn:
+    column: str
+    allowed: frozenset
+
+    @property
+    def name(self) -> str:
+        return f"{self.column}_unknown"
+
+    def mask(self, view: ChunkView, state: dict) -> np.ndarray:
+        allowed = {str(v) for v in self.allowed}
+        return _per_category(view.strings(self.column), lambda categories: ~categories.isin(allowed))
+
+
+@dataclass(frozen=True)
+class Matches:
+    column: str
+    pattern: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.column}_unknown"
+
+    def mask(self, view: ChunkView, state: dict) -> np.ndarray:
+        return _per_category(view.strings(self.column),
+                             lambda categories: ~np.asarray(categories.str.fullmatch(self.pattern), dtype=bool))
+
+
+@dataclass(frozen=True)
+class UniqueKey:
+    """Rows repeating a full record key of an earlier row of the same file.
+
+    Without all key columns (e.g. no Shift column) there is no record key and
+    nothing is flagged; rows with a missing key value are never flagged.
+    """
+    columns: Sequence[str] = KEY_COLUMNS
+
+    @property
+    def name(self) -> str:
+        return "duplicate_key"
+
+    def mask(self, view: ChunkView, state: dict) -> np.ndarray:
+        if not len(view) or any(col not in view.chunk for col in self.columns):
+            return np.zeros(len(view), dtype=bool)
+        keys = pd.DataFrame({col: view.dates(col) if col == "Date" else view.strings(col) for col in self.columns})
+        complete = keys.notna().all(axis=1).to_numpy()
+        if SOURCE_COLUMN in view.chunk:
+            keys[SOURCE_COLUMN] = view.strings(SOURCE_COLUMN)
+        hashes = pd.util.hash_pandas_object(keys[complete], index=False).to_numpy()
+        seen = state.setdefault(("seen_keys", view.source), set())
+        # One hash probe per row against earlier chunks, plus duplicates within this chunk
+        repeated = np.fromiter(map(seen.__contains__, hashes.tolist()), dtype=bool, count=len(hashes))
+        repeated |= pd.Series(hashes).duplicated().to_numpy()
+        seen.update(hashes.tolist())
+        duplicate = np.zeros(len(view), dtype=bool)
+        duplicate[complete] = repeated
+        return duplicate
+
+
+@dataclass(frozen=True)
+class Outlier:
+    """More than ``k`` standard deviations from the mean of its ``by`` group within the chunk."""
+    column: str
+    k: float = 4.0
+    by: Optional[str] = "Machine_ID"
+
+    @property
+    def name(self) -> str:
+        return f"{self.column}_outlier"
+
+    def mask(self, view: ChunkView, state: dict) -> np.ndarray:
+        values = view.numbers(self.column)
+        if self.by is not None and self.by in view.chunk:
+            groups = values.groupby(view.strings(self.by).cat.codes)
+            mean, std = groups.transform("mean"), groups.transform("std", ddof=0)
+        else:
+            mean, std = values.mean(), values.std(ddof=0)
+        return ((values - mean).abs() > self.k * std).to_numpy(dtype=bool)
+
+
+def default_rules(known_machines: Optional[Iterable[str]] = None) -> List:
+    machine_rule = (IsIn("Machine_ID", frozenset(map(str, known_machines))) if known_machines is not None
+                    else Matches("Machine_ID", MACHINE_ID_PATTERN))
+    return [
+        NotNull("Date"),
+        InRange("Date", "2000-01-01", "now"),
+        NotNull("Production_Units"),
+        NonNegative("Production_Units"),
+        NotNull("Machine_ID"),
+        machine_rule,
+        UniqueKey(KEY_COLUMNS),
+        Outlier("Production_Units"),
+    ]
+
+
+# =========================
+# --- Checker -------------
+# =========================
+@dataclass
+class QualityReport:
+    by_file: pd.DataFrame  # File, Rows, one column per rule, Error_Rows, Data_Quality
+    rules: List[str] = field(default_factory=list)
+
+    @property
+    def dataset(self) -> pd.Series:
+        totals = self.by_file[["Rows", *self.rules, "Error_Rows"]].sum()
+        totals["Data_Quality"] = float(data_quality_vec(totals["Error_Rows"], totals["Rows"]))
+        return totals
+
+    @property
+    def data_quality(self) -> float:
+        return float(self.dataset["Data_Quality"])
+
+    @property
+    def error_rows(self) -> int:
+        return int(self.by_file["Error_Rows"].sum())
+
+    def __str__(self) -> str:
+        totals = self.dataset
+        failing = ", ".join(f"{rule}={int(totals[rule])}" for rule in self.rules if totals[rule])
+        return (f"{int(totals['Rows']):,} rows, {int(totals['Error_Rows']):,} with errors "
+                f"(data quality {totals['Data_Quality']:.3f}){': ' + failing if failing else ''}")
+
+
+class QualityChecker:
+    """Evaluate a rule list over chunks and keep per-file violation counts.
+
+    Args:
+        rules: Rule objects (see default_rules()).
+    """
+
+    def __init__(self, rules: Optional[Sequence] = None):
+        self.rules = list(rules) if rules is not None else default_rules()
+        self.names = [rule.name for rule in self.rules]
+        self._state: dict = {}
+        self._counts: Dict[str, np.ndarray] = {}  # file -> [rows, per-rule..., error rows]
+
+    def violations(self, chunk: pd.DataFrame, source: Optional[str] = None) -> np.ndarray:
+        """(rows x rules) boolean matrix; True where a row breaks a rule."""
+        view = ChunkView(chunk, source)
+        if not len(view):
+            return np.zeros((0, len(self.rules)), dtype=bool)
+        return np.column_stack([rule.mask(view, self._state) for rule in self.rules])
+
+    def update(self, chunk: pd.DataFrame, source: Optional[str] = None) -> np.ndarray:
+        """Check one chunk; rows are attributed to ``source``, or to their __source_file column."""
+        matrix = self.violations(chunk, source)
+        if source is None and SOURCE_COLUMN in chunk:
+            codes, files = pd.factorize(chunk[SOURCE_COLUMN].astype(str))
+        else:
+            codes, files = np.zeros(len(chunk), dtype=np.intp), [source or DATASET]
+        counts = np.column_stack([np.ones(len(chunk), dtype=bool), matrix, matrix.any(axis=1)])
+        per_file = np.column_stack([np.bincount(codes, weights=column, minlength=len(files))
+                                    for column in counts.T]).astype(np.int64)
+        for file, row in zip(files, per_file):
+            self._counts[file] = self._counts.get(file, 0) + row
+        return matrix
+
+    def tap(self, chunks: Iterable[pd.DataFrame], source: Optional[str] = None):
+        """Pass ``chunks`` through unchanged while checking them (for streaming pipelines)."""
+        for chunk in chunks:
+            self.update(chunk, source)
+            yield chunk
+
+    def check_frame(self, frame: pd.DataFrame, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> QualityReport:
+        for start in range(0, len(frame), chunk_rows):
+            self.update(frame.iloc[start:start + chunk_rows])
+        return self.report()
+
+    def report(self) -> QualityReport:
+        columns = ["Rows", *self.names, "Error_Rows"]
+        by_file = pd.DataFrame(list(self._counts.values()), columns=columns, dtype="int64")
+        by_file.insert(0, "File", list(self._counts))
+        by_file["Data_Quality"] = data_quality_vec(by_file["Error_Rows"], by_file["Rows"])
+        return QualityReport(by_file, list(self.names))
+
+
+def check_quality(frame: pd.DataFrame, rules: Optional[Sequence] = None) -> QualityReport:
+    return QualityChecker(rules).check_frame(frame)
@@ -0,0 +1,214 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Incremental, multi-process factory report ingestion
+# Developed using Python by Heider Jeffer
+#
+# Keeps a manifest of every ingested report (path, mtime, size, sha256) next
+# to a cached combined dataset. Each run only re-reads files that are new or
+# whose content changed, parses them in a process pool and merges their rows
+# into the cached dataset, so run time scales with the delta.
+import glob
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from columnar_cache import read_cached
+from compact_types import CompactionReport, compact_frame, concat_compact, memory_footprint
+from report_readers import REPORT_COLUMNS, is_supported
+
+logger = logging.getLogger(__name__)
+
+SOURCE_COLUMN = "__source_file"
+MANIFEST_VERSION = 1
+DEFAULT_CACHE_DIR = "ingest_cache"
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    path: str
+    mtime: float
+    size: int
+    sha256: str
+
+    def same_stat(self, mtime: float, size: int) -> bool:
+        return self.mtime == mtime and self.size == size
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint(path: str) -> FileFingerprint:
+    stat = os.stat(path)
+    return FileFingerprint(path, stat.st_mtime, stat.st_size, file_sha256(path))
+
+
+def read_report(path: str) -> pd.DataFrame:
+    """Parse one factory report (Excel, CSV or Parquet) and tag its rows with the source path.
+
+    Only the report columns are read. Workbooks go through the columnar
+    cache, so they are also available to later readers as typed Parquet.
+    Module-level so it can be shipped to worker processes.
+    """
+    frame = read_cached(path, columns=REPORT_COLUMNS)
+    frame[SOURCE_COLUMN] = path
+    return frame
+
+
+@dataclass
+class IngestResult:
+    data: pd.DataFrame
+    new: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    delta: Optional[pd.DataFrame] = None  # rows parsed in this run (new + changed files)
+    compaction: Optional[CompactionReport] = None  # memory footprint of the delta before/after compaction
+
+    @property
+    def files(self) -> List[str]:
+        return self.new + self.changed + self.unchanged
+
+
+class IngestionEngine:
+    """Incrementally ingest the workbooks matched by ``pattern``.
+
+    Args:
+        pattern: Glob pattern of the input reports; files without a registered
+            reader (see report_readers.py) are skipped.
+        cache_dir: Directory holding the manifest and the combined dataset.
+        max_workers: Process pool size; ``None`` lets the executor decide.
+        reader: Picklable callable ``path -> DataFrame`` used to parse a file.
+    """
+
+    def __init__(self, pattern: str = "factory_reports/*", cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_workers: Optional[int] = None, reader=read_report):
+        self.pattern = pattern
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.reader = reader
+        self.manifest_path = os.path.join(cache_dir, "manifest.json")
+        self.data_path = os.path.join(cache_dir, "combined.pkl")
+
+    # --- Manifest & cached dataset ---
+    def load_manifest(self) -> Dict[str, FileFingerprint]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, encoding="utf-8") as fh:
+            payload = json.load(fh)
+        if payload.get("version") != MANIFEST_VERSION:
+            return {}
+        return {entry["path"]: FileFingerprint(**entry) for entry in payload["files"]}
+
+    def save_manifest(self, manifest: Dict[str, FileFingerprint]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        payload = {"version": MANIFEST_VERSION, "files": [asdict(fp) for fp in manifest.values()]}
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump(payload, fh, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def load_data(self) -> pd.DataFrame:
+        if not os.path.exists(self.data_path):
+            return pd.DataFrame()
+        return pd.read_pickle(self.data_path)
+
+    def save_data(self, data: pd.DataFrame) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.data_path + ".tmp"
+        data.to_pickle(tmp_path)
+        os.replace(tmp_path, self.data_path)
+
+    # --- Planning ---
+    def discover(self) -> List[str]:
+        files = sorted(path for path in glob.glob(self.pattern) if is_supported(path))
+        logger.info("Found %d files using pattern '%s'", len(files), self.pattern)
+        return files
+
+    def known_files(self, extra: Iterable[str] = ()) -> List[str]:
+        """Ingested files that still exist plus ``extra``, without globbing."""
+        files = sorted(path for path in {*self.load_manifest(), *extra} if os.path.exists(path) and is_supported(path))
+        logger.info("Checking %d known or reported files", len(files))
+        return files
+
+    def plan(self, files: List[str], manifest: Dict[str, FileFingerprint]):
+        """Split ``files`` into new, changed, unchanged and removed paths.
+
+        A file whose mtime and size match the manifest is trusted without
+        hashing; otherwise its content hash decides whether it changed.
+        Returns the four lists plus the updated manifest.
+        """
+        new, changed, unchanged = [], [], []
+        updated: Dict[str, FileFingerprint] = {}
+        for path in files:
+            stat = os.stat(path)
+            known = manifest.get(path)
+            if known is not None and known.same_stat(stat.st_mtime, stat.st_size):
+                updated[path] = known
+                unchanged.append(path)
+                continue
+            current = FileFingerprint(path, stat.st_mtime, stat.st_size, file_sha256(path))
+            updated[path] = current
+            if known is None:
+                new.append(path)
+            elif known.sha256 == current.sha256:
+                unchanged.append(path)
+            else:
+                changed.append(path)
+        removed = sorted(set(manifest) - set(files))
+        return new, changed, unchanged, removed, updated
+
+    # --- Parsing ---
+    def read_files(self, paths: List[str]) -> List[pd.DataFrame]:
+        if len(paths) <= 1 or self.max_workers == 1:
+            frames = [self.reader(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                frames = list(pool.map(self.reader, paths))
+        for path, frame in zip(paths, frames):
+            logger.info("Ingested file: %s (rows=%d)", path, len(frame))
+        return frames
+
+    # --- Run ---
+    def run(self, files: Optional[List[str]] = None) -> IngestResult:
+        """Bring the cached combined dataset up to date and return it."""
+        if files is None:
+            files = self.discover()
+        manifest = self.load_manifest()
+        if not os.path.exists(self.data_path):
+            manifest = {}
+        data = self.load_data()
+        new, changed, unchanged, removed, updated = self.plan(files, manifest)
+
+        stale = set(changed) | set(removed)
+        if stale and not data.empty:
+            data = data[~data[SOURCE_COLUMN].isin(stale)]
+        to_read = new + changed
+        compaction = CompactionReport()
+        frames = [compact_frame(frame, report=compaction) for frame in self.read_files(to_read)]
+        if frames:
+            data = concat_compact([data, *frames] if not data.empty else frames)
+            logger.info("Compacted new rows: %s", compaction)
+        elif stale:
+            data = data.reset_index(drop=True)
+        if frames or stale:
+            # Drops categories of retracted files and upgrades caches written before compaction
+            data = compact_frame(data)
+
+        if to_read or stale or updated != manifest:
+            self.save_data(data)
+            self.save_manifest(updated)
+        logger.info("Combined DataFrame rows: %d, memory: %.2f MiB (new=%d, changed=%d, removed=%d, cached=%d)",
+                    len(data), memory_footprint(data) / 2**20, len(new), len(changed), len(removed), len(unchanged))
+        delta = concat_compact(frames) if frames else data.iloc[:0]
+        return IngestResult(data, new, changed, removed, unchanged, delta, compaction)
@@ -0,0 +1,196 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Atomic, deduplicated report publishing for automated_reports
+# Developed using Python by Heider Jeffer
+#
+# summary.to_excel(path) writes in place: a second batch run on the same day,
+# or a reader such as the ERP upload, can see a half-written workbook. The
+# publisher never writes to the published name:
+#
+#   1. the report is written to a temp file,
+#   2. it is stored content-addressed as .objects/<key>.xlsx, where the key is
+#      a hash of the data (the .xlsx bytes differ between runs because of
+#      embedded timestamps, so identical summaries would never dedup by bytes),
+#   3. the published name is hard-linked to that object under a temp name and
+#      moved into place with os.replace, which is atomic.
+#
+# When an object for the same data already exists, steps 1-2 are skipped and
+# the existing workbook is linked again, so re-publishing an unchanged summary
+# costs no Excel export and hands the ERP queue byte-identical files. Each
+# report name has its own lock file (.locks/<name>.lock); publishers of
+# different reports, e.g. pipelines of different sites, never wait for each
+# other. Published files share their inode with the object: treat them as
+# read-only.
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_DIR = "automated_reports"
+OBJECTS_DIR = ".objects"
+LOCKS_DIR = ".locks"
+
+# mkstemp creates files as 0600; stored objects (and so published reports) are world-readable
+REPORT_MODE = 0o644
+
+
+@dataclass(frozen=True)
+class Published:
+    path: str
+    key: str
+    reused: bool  # True when an identical report was already stored
+
+
+def frame_key(frame: pd.DataFrame, suffix: str = ".xlsx") -> str:
+    """Content key of a report built from ``frame``: its values, dtypes and column names."""
+    digest = hashlib.sha256(suffix.encode("utf-8"))
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in frame.dtypes.items()]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Exclusive advisory lock on ``path`` (created if missing), held for the block."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+b") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _link_or_copy(source: str, target: str) -> None:
+    try:
+        os.link(source, target)
+    except OSError:  # no hard links on this file system
+        shutil.copyfile(source, target)
+
+
+class ReportPublisher:
+    """Publish reports into ``output_dir`` atomically, deduplicated by content."""
+
+    def __init__(self, output_dir: str = DEFAULT_OUTPUT_DIR):
+        self.output_dir = output_dir
+        self.objects_dir = os.path.join(output_dir, OBJECTS_DIR)
+        self.locks_dir = os.path.join(output_dir, LOCKS_DIR)
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    def object_path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.objects_dir, f"{key}{suffix}")
+
+    def lock(self, name: str):
+        return file_lock(os.path.join(self.locks_dir, f"{os.path.basename(name)}.lock"))
+
+    def _temp_path(self, directory: str, name: str, suffix: str = "") -> str:
+        # Keep the real extension last: pandas picks the Excel writer from it
+        fd, path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=f".tmp{suffix}")
+        os.close(fd)
+        return path
+
+    def store_object(self, write: Callable[[str], None], key: str, suffix: str) -> bool:
+        """Make sure the object for ``key`` exists; returns False when it already did."""
+        obj = self.object_path(key, suffix)
+        if os.path.exists(obj):
+            return False
+        tmp = self._temp_path(self.objects_dir, key, suffix)
+        try:
+            write(tmp)
+            with open(tmp, "rb") as fh:
+                os.fsync(fh.fileno())
+            os.chmod(tmp, REPORT_MODE)
+            try:
+                os.link(tmp, obj)  # fails if a concurrent publisher stored the same data first
+            except FileExistsError:
+                return False
+            except OSError:
+                os.replace(tmp, obj)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return True
+
+    def publish(self, write: Callable[[str], None], name: str, key: str) -> Published:
+        """Publish the report ``write(path)`` produces as ``output_dir/name``.
+
+        ``key`` identifies the report content; ``write`` is only called when
+        no report with that key was stored before.
+        """
+        suffix = os.path.splitext(name)[1]
+        target = os.path.join(self.output_dir, name)
+        with self.lock(name):
+            created = self.store_object(write, key, suffix)
+            try:
+                linked = self._link_target(key, suffix, name)
+            except FileNotFoundError:
+                # collect_garbage removed the (old, unlinked) object after store_object saw
+                # it; the re-stored object is new, so the age guard keeps it until linked
+                logger.info("Object %s... was collected while publishing %s; storing it again", key[:12], target)
+                created = self.store_object(write, key, suffix)
+                linked = self._link_target(key, suffix, name)
+            if not linked:
+                return Published(target, key, reused=True)
+        logger.info("Published %s (%s, key %s...)", target, "new" if created else "deduplicated", key[:12])
+        return Published(target, key, reused=not created)
+
+    def _link_target(self, key: str, suffix: str, name: str) -> bool:
+        """Point ``output_dir/name`` at the object; False when it already was."""
+        obj = self.object_path(key, suffix)
+        target = os.path.join(self.output_dir, name)
+        if os.path.exists(target) and os.path.samefile(obj, target):
+            return False
+        tmp = self._temp_path(self.output_dir, name, suffix)
+        os.remove(tmp)
+        try:
+            _link_or_copy(obj, tmp)
+            os.replace(tmp, target)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return True
+
+    def publish_frame(self, frame: pd.DataFrame, name: str) -> Published:
+        """Publish ``frame`` as an Excel report."""
+        return self.publish(lambda path: frame.to_excel(path, index=False), name,
+                            frame_key(frame, os.path.splitext(name)[1]))
+
+    def collect_garbage(self, min_age_seconds: float = 3600.0) -> int:
+        """Delete stored objects no published report links to any more (hard-link count 1).
+
+        Objects younger than ``min_age_seconds`` are kept, so an object a
+        concurrent publisher has stored but not linked yet is never removed.
+        Older unlinked objects may be removed while a publisher is about to
+        reuse them; ``publish`` then stores the object again.
+        """
+        removed = 0
+        now = time.time()
+        for entry in os.scandir(self.objects_dir):
+            stat = entry.stat()
+            if (entry.is_file() and ".tmp" not in entry.name and stat.st_nlink == 1
+                    and now - stat.st_mtime > min_age_seconds):
+                os.remove(entry.path)
+                removed += 1
+        return removed
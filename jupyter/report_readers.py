@@ -0,0 +1,227 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Factory report readers keyed by file extension
+# Developed using Python by Heider Jeffer
+#
+# MES exports arrive as Excel, CSV or Parquet. Each format is registered with
+# the fastest reader available for it:
+#   .csv              -> pyarrow.csv (multi-threaded), pandas as fallback
+#   .parquet / .pq    -> pyarrow with column projection, only the requested
+#                        columns are decoded
+#   .xlsx / .xlsm / .xls -> pandas/openpyxl, the slow path; these are marked
+#                        cacheable so the columnar cache parses each
+#                        workbook only once
+# Every reader returns the report columns normalized to the same dtypes, so
+# the pipeline does not care which format a file came in. Formats can also
+# register a chunk reader, which the streaming pipeline uses to read a file
+# in bounded row chunks; the others are read whole and sliced.
+import os
+from io import BytesIO
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:  # pandas readers are used without pyarrow
+    pa = None
+    pa_csv = None
+    pq = None
+
+# Columns the pipeline reads; Site and Shift are optional and only kept when a file has them
+REPORT_COLUMNS = ("Date", "Production_Units", "Machine_ID", "Site", "Shift")
+
+
+class RegisteredReader(NamedTuple):
+    read: Callable[..., pd.DataFrame]
+    cacheable: bool
+
+
+_READERS: Dict[str, RegisteredReader] = {}
+_CHUNK_READERS: Dict[str, Callable[..., Iterator[pd.DataFrame]]] = {}
+
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def normalize_types(frame: pd.DataFrame) -> pd.DataFrame:
+    """Coerce the factory report columns to their typed representation."""
+    frame = frame.copy()
+    if "Date" in frame:
+        frame["Date"] = pd.to_datetime(frame["Date"], errors="coerce")
+    if "Production_Units" in frame:
+        units = pd.to_numeric(frame["Production_Units"], errors="coerce")
+        whole = units.dropna()
+        if (whole == whole.round()).all():
+            units = units.astype("Int64") if units.isna().any() else units.astype("int64")
+        frame["Production_Units"] = units
+    if "Machine_ID" in frame:
+        frame["Machine_ID"] = frame["Machine_ID"].astype("category")
+    return frame
+
+
+def project(frame: pd.DataFrame, columns: Optional[Sequence[str]]) -> pd.DataFrame:
+    """The requested columns ``frame`` has, in request order (all of them for None)."""
+    if columns is None:
+        return frame
+    return frame[[col for col in columns if col in frame.columns]]
+
+
+# =========================
+# --- Registry ------------
+# =========================
+def register_reader(*extensions: str, cacheable: bool = False):
+    """Register ``fn(source, columns) -> DataFrame`` for the given extensions.
+
+    ``source`` is a path or a binary file object; ``columns`` is the list of
+    columns to read, or None for all of them.
+    """
+    def decorator(fn):
+        for extension in extensions:
+            _READERS[extension.lower()] = RegisteredReader(fn, cacheable)
+        return fn
+    return decorator
+
+
+def register_chunk_reader(*extensions: str):
+    """Register ``fn(path, columns, chunk_rows) -> Iterator[DataFrame]`` for the given extensions."""
+    def decorator(fn):
+        for extension in extensions:
+            _CHUNK_READERS[extension.lower()] = fn
+        return fn
+    return decorator
+
+
+def extension_of(name: str) -> str:
+    return os.path.splitext(str(name))[1].lower()
+
+
+def supported_extensions():
+    return sorted(_READERS)
+
+
+def is_supported(name: str) -> bool:
+    return extension_of(name) in _READERS
+
+
+def reader_for(name: str) -> RegisteredReader:
+    try:
+        return _READERS[extension_of(name)]
+    except KeyError:
+        raise ValueError(f"Unsupported report format {extension_of(name) or name!r}; "
+                         f"expected one of {', '.join(supported_extensions())}") from None
+
+
+def read_report_file(path: str, columns: Optional[Sequence[str]] = REPORT_COLUMNS) -> pd.DataFrame:
+    """Read ``path`` with the reader registered for its extension."""
+    return reader_for(path).read(path, columns)
+
+
+def iter_report_chunks(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                       columns: Optional[Sequence[str]] = REPORT_COLUMNS) -> Iterator[pd.DataFrame]:
+    """Yield ``path`` as normalized DataFrames of at most ``chunk_rows`` rows.
+
+    Formats without a chunk reader are read whole and sliced.
+    """
+    chunks = _CHUNK_READERS.get(extension_of(path))
+    if chunks is not None:
+        yield from chunks(path, columns, chunk_rows)
+        return
+    frame = read_report_file(path, columns)
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows]
+
+
+def read_report_bytes(data: bytes, name: str, columns: Optional[Sequence[str]] = REPORT_COLUMNS) -> pd.DataFrame:
+    """Read an uploaded file; ``name`` only selects the reader."""
+    return reader_for(name).read(BytesIO(data), columns)
+
+
+# =========================
+# --- Readers -------------
+# =========================
+@register_reader(".csv")
+def read_csv_report(source, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    if pa_csv is None:
+        usecols = (lambda col: col in columns) if columns is not None else None
+        return normalize_types(pd.read_csv(source, usecols=usecols))
+    convert = pa_csv.ConvertOptions()
+    if columns is not None:
+        convert = pa_csv.ConvertOptions(include_columns=list(columns), include_missing_columns=True)
+    table = pa_csv.read_csv(source, convert_options=convert)
+    # Requested columns the file lacks come back as all-null columns of type null
+    present = [field.name for field in table.schema if field.type != pa.null()]
+    return normalize_types(table.select(present).to_pandas())
+
+
+@register_reader(".parquet", ".pq")
+def read_parquet_report(source, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    if pq is None:
+        return normalize_types(project(pd.read_parquet(source), columns))
+    parquet = pq.ParquetFile(source, memory_map=isinstance(source, str))
+    if columns is not None:
+        columns = [col for col in columns if col in parquet.schema_arrow.names]
+    return normalize_types(parquet.read(columns=columns).to_pandas())
+
+
+@register_reader(".xlsx", ".xlsm", ".xls", cacheable=True)
+def read_excel_report(source, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    usecols = (lambda col: col in columns) if columns is not None else None
+    return normalize_types(pd.read_excel(source, usecols=usecols))
+
+
+# =========================
+# --- Chunk readers -------
+# =========================
+@register_chunk_reader(".csv")
+def iter_csv_chunks(path: str, columns: Optional[Sequence[str]], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    usecols = (lambda col: col in columns) if columns is not None else None
+    with pd.read_csv(path, usecols=usecols, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield normalize_types(project(chunk, columns))
+
+
+@register_chunk_reader(".parquet", ".pq")
+def iter_parquet_chunks(path: str, columns: Optional[Sequence[str]], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if pq is None:
+        frame = read_parquet_report(path, columns)
+        for start in range(0, len(frame), chunk_rows):
+            yield frame.iloc[start:start + chunk_rows]
+        return
+    parquet = pq.ParquetFile(path, memory_map=True)
+    if columns is not None:
+        columns = [col for col in columns if col in parquet.schema_arrow.names]
+    for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+        yield normalize_types(batch.to_pandas())
+
+
+@register_chunk_reader(".xlsx", ".xlsm")
+def iter_excel_chunks(path: str, columns: Optional[Sequence[str]], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """The first sheet of ``path`` in chunks of ``chunk_rows`` rows.
+
+    Uses openpyxl's read-only mode, which streams rows from the XML instead of
+    building the whole worksheet in memory.
+    """
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = list(header)
+        wanted = [i for i, col in enumerate(header) if columns is None or col in columns]
+        if columns is not None:
+            wanted.sort(key=lambda i: list(columns).index(header[i]))
+        names = [header[i] for i in wanted]
+        batch: List[tuple] = []
+        for row in rows:
+            batch.append(tuple(row[i] for i in wanted))
+            if len(batch) >= chunk_rows:
+                yield normalize_types(pd.DataFrame(batch, columns=names))
+                batch = []
+        if batch:
+            yield normalize_types(pd.DataFrame(batch, columns=names))
+    finally:
+        workbook.close()
@@ -0,0 +1,265 @@
+# Siemens Energy Digitalization Transformation Engineer
+# File watcher daemon: factory_reports -> debounced batch runs
+# Developed using Python by Heider Jeffer
+#
+# Instead of re-running the batch on a schedule (and logging "Found 0 files"
+# most of the time), the watcher stays up, imports everything once and waits
+# for factory_reports to change. Events come from inotify on Linux (watchdog's
+# native observer); without watchdog, or with --poll for network shares, the
+# directory is stat-scanned every poll interval instead.
+#
+# A reported file is only handed on once it has settled: its size and mtime
+# must stay the same for --settle seconds, so a workbook that is still being
+# copied or saved is never parsed half-written. Excel lock files (~$*.xlsx),
+# temp files and formats without a reader are ignored. Settled paths are fed
+# to automation_framework.run_batch(paths=...), which checks just those files
+# next to the ones already ingested; deletions trigger a run that retracts
+# the removed reports.
+#
+# Usage (from the jupyter directory):
+#   python report_watcher.py
+#   python report_watcher.py --settle 5 --poll
+import argparse
+import fnmatch
+import logging
+import os
+import queue
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from automation_framework import INPUT_PATTERN, run_batch, setup_logging
+from report_readers import is_supported
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # polling only
+    FileSystemEventHandler = object
+    Observer = None
+
+logger = logging.getLogger("report_watcher")
+
+DEFAULT_SETTLE_SECONDS = 2.0
+DEFAULT_POLL_INTERVAL = 1.0
+_IGNORED_PREFIXES = ("~$", ".")
+_IGNORED_SUFFIXES = (".tmp", ".part", ".crdownload")
+
+Signature = Tuple[int, float]  # (size, mtime)
+
+
+def _signature(path: str) -> Optional[Signature]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime
+
+
+class SettleTracker:
+    """Debounce: a path is ready once its (size, mtime) has not changed for ``settle_seconds``."""
+
+    def __init__(self, settle_seconds: float = DEFAULT_SETTLE_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.settle_seconds = settle_seconds
+        self.clock = clock
+        self.pending: Dict[str, Tuple[Optional[Signature], float]] = {}
+        self.deleted: Set[str] = set()
+
+    def touch(self, path: str) -> None:
+        self.deleted.discard(path)
+        self.pending[path] = (_signature(path), self.clock())
+
+    def delete(self, path: str) -> None:
+        self.pending.pop(path, None)
+        self.deleted.add(path)
+
+    def ready(self) -> Tuple[List[str], List[str]]:
+        """Pop (settled paths, deleted paths); paths still changing stay pending.
+
+        A file that is still empty after the settle window is dropped instead
+        of being polled forever; the write that fills it reports it again.
+        """
+        now = self.clock()
+        settled = []
+        for path, (signature, since) in list(self.pending.items()):
+            current = _signature(path)
+            if current is None:
+                self.delete(path)
+            elif current != signature:
+                self.pending[path] = (current, now)
+            elif now - since >= self.settle_seconds:
+                del self.pending[path]
+                if current[0] > 0:
+                    settled.append(path)
+                else:
+                    logger.debug("Ignoring empty file %s until it is written", path)
+        deleted, self.deleted = sorted(self.deleted), set()
+        return sorted(settled), deleted
+
+    @property
+    def next_deadline(self) -> Optional[float]:
+        if not self.pending:
+            return None
+        return min(since for _, since in self.pending.values()) + self.settle_seconds
+
+
+class _QueueHandler(FileSystemEventHandler):
+    """watchdog handler that forwards (kind, path) pairs to the watcher thread."""
+
+    def __init__(self, events: "queue.Queue[Tuple[str, str]]"):
+        super().__init__()
+        self.events = events
+
+    def on_any_event(self, event) -> None:
+        if event.is_directory:
+            return
+        if event.event_type == "moved":
+            self.events.put(("deleted", event.src_path))
+            self.events.put(("changed", event.dest_path))
+        elif event.event_type == "deleted":
+            self.events.put(("deleted", event.src_path))
+        elif event.event_type in ("created", "modified", "closed"):
+            self.events.put(("changed", event.src_path))
+
+
+class ReportWatcher:
+    """Watch the directory of ``pattern`` and run ``on_batch(paths)`` for settled reports.
+
+    Args:
+        pattern: Glob pattern of the input reports (only its directory is watched).
+        on_batch: Called with the settled (and deleted) paths of one burst.
+        settle_seconds: How long a file must stay unchanged before it is used.
+        poll_interval: Scan interval of the polling fallback.
+        use_polling: Stat-scan even when inotify (watchdog) is available.
+    """
+
+    def __init__(self, pattern: str = INPUT_PATTERN, on_batch: Optional[Callable[[List[str]], object]] = None,
+                 settle_seconds: float = DEFAULT_SETTLE_SECONDS, poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 use_polling: bool = False):
+        self.pattern = pattern
+        self.directory = os.path.dirname(pattern) or "."
+        self.on_batch = on_batch or (lambda paths: run_batch(pattern, paths=paths))
+        self.tracker = SettleTracker(settle_seconds)
+        self.poll_interval = poll_interval
+        self.use_polling = use_polling or Observer is None
+        self.events: "queue.Queue[Tuple[str, str]]" = queue.Queue()
+        self._observer = None
+        self._snapshot: Dict[str, Signature] = {}
+        self._stopped = False
+
+    def wanted(self, path: str) -> bool:
+        name = os.path.basename(path)
+        return (fnmatch.fnmatch(path, self.pattern) and is_supported(path)
+                and not name.startswith(_IGNORED_PREFIXES) and not name.endswith(_IGNORED_SUFFIXES))
+
+    # --- Event sources ---
+    def start(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._snapshot = self._scan()
+        if not self.use_polling:
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_QueueHandler(self.events), self.directory, recursive=False)
+                self._observer.start()
+            except OSError as exc:  # e.g. inotify watch limit reached
+                logger.warning("inotify unavailable (%s); falling back to polling", exc)
+                self._observer = None
+                self.use_polling = True
+        logger.info("Watching %s (%s, settle %.1fs)", self.pattern,
+                    "polling" if self.use_polling else "inotify", self.tracker.settle_seconds)
+
+    def stop(self) -> None:
+        self._stopped = True
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def _scan(self) -> Dict[str, Signature]:
+        snapshot = {}
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                stat = entry.stat()
+                snapshot[os.path.join(self.directory, entry.name)] = (stat.st_size, stat.st_mtime)
+        return snapshot
+
+    def _poll(self) -> None:
+        snapshot = self._scan()
+        for path, signature in snapshot.items():
+            if self._snapshot.get(path) != signature:
+                self.events.put(("changed", path))
+        for path in self._snapshot.keys() - snapshot.keys():
+            self.events.put(("deleted", path))
+        self._snapshot = snapshot
+
+    # --- Main loop ---
+    def _drain(self, timeout: float) -> None:
+        try:
+            kind, path = self.events.get(timeout=timeout)
+        except queue.Empty:
+            return
+        while True:
+            # Events carry paths as watchdog joined them; key them like the glob pattern does
+            path = os.path.join(self.directory, os.path.basename(path))
+            if self.wanted(path) and kind == "changed":
+                self.tracker.touch(path)
+            elif self.wanted(path):
+                self.tracker.delete(path)
+            try:
+                kind, path = self.events.get_nowait()
+            except queue.Empty:
+                return
+
+    def step(self) -> List[str]:
+        """Process pending events once; returns the paths handed to ``on_batch``."""
+        deadline = self.tracker.next_deadline
+        timeout = self.poll_interval if deadline is None else max(0.0, deadline - self.tracker.clock())
+        if self.use_polling:
+            self._poll()
+            timeout = min(timeout, self.poll_interval)
+        self._drain(timeout)
+        settled, deleted = self.tracker.ready()
+        paths = settled + deleted
+        if paths:
+            logger.info("Reports ready: %d settled, %d deleted (%s)", len(settled), len(deleted), ", ".join(paths))
+            self._run_batch(paths)
+        return paths
+
+    def _run_batch(self, paths: List[str]) -> None:
+        try:
+            self.on_batch(paths)
+        except Exception:  # keep watching; the next change to these files retries them
+            logger.exception("Batch run failed for %s", ", ".join(paths) or "existing reports")
+
+    def run_forever(self, catch_up: bool = True) -> None:
+        """Watch until interrupted; ``catch_up`` first runs one batch over everything already there."""
+        self.start()
+        try:
+            if catch_up:
+                self._run_batch(sorted(path for path in self._snapshot if self.wanted(path)))
+            while not self._stopped:
+                self.step()
+        except KeyboardInterrupt:
+            logger.info("Watcher interrupted")
+        finally:
+            self.stop()
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Watch factory_reports and ingest reports as they land")
+    parser.add_argument("--pattern", default=INPUT_PATTERN)
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE_SECONDS,
+                        help="seconds a file must stay unchanged before it is ingested")
+    parser.add_argument("--poll", action="store_true", help="stat-scan instead of using inotify")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL)
+    parser.add_argument("--no-catch-up", action="store_true", help="skip the initial batch over existing files")
+    parser.add_argument("--erp-url", help="upload over HTTP instead of copying into upload_area/ERP")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    watcher = ReportWatcher(args.pattern, lambda paths: run_batch(args.pattern, paths=paths, erp_url=args.erp_url),
+                            settle_seconds=args.settle, poll_interval=args.poll_interval, use_polling=args.poll)
+    watcher.run_forever(catch_up=not args.no_catch_up)
+
+
+if __name__ == "__main__":
+    main()
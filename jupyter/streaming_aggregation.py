@@ -0,0 +1,90 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Streaming chunked aggregation of Production_Units
+# Developed using Python by Heider Jeffer
+#
+# Reads factory reports (any format in report_readers.py) row-chunk by
+# row-chunk through a generator pipeline (read -> clean -> aggregate) and
+# keeps running per-Date (optionally per-Machine_ID) partial sums. Peak memory is bounded by ``chunk_rows`` and
+# the number of distinct groups, not by the size of the history, and the final
+# summary matches ``df.groupby('Date')['Production_Units'].sum()``.
+import logging
+from typing import Dict, Iterable, Iterator, Sequence, Tuple
+
+import pandas as pd
+
+from report_readers import DEFAULT_CHUNK_ROWS, iter_report_chunks
+
+logger = logging.getLogger(__name__)
+
+UNITS_COLUMN = "Production_Units"
+
+
+def iter_chunks(paths: Iterable[str], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    for path in paths:
+        for chunk in iter_report_chunks(path, chunk_rows):
+            logger.debug("Read chunk from %s (rows=%d)", path, len(chunk))
+            yield chunk
+
+
+def clean_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Apply the DailyOutputMonitor cleaning step (Step 3) to one chunk."""
+    chunk = chunk.copy()
+    chunk["Date"] = pd.to_datetime(chunk["Date"], errors="coerce")
+    chunk[UNITS_COLUMN] = pd.to_numeric(chunk[UNITS_COLUMN], errors="coerce")
+    chunk = chunk.dropna(subset=[UNITS_COLUMN])
+    units = chunk[UNITS_COLUMN]
+    if (units == units.round()).all():
+        chunk[UNITS_COLUMN] = units.astype("int64")
+    return chunk
+
+
+def iter_clean_chunks(paths: Iterable[str], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    return (clean_chunk(chunk) for chunk in iter_chunks(paths, chunk_rows))
+
+
+class StreamingAggregator:
+    """Running ``groupby(by)[Production_Units].sum()`` over a stream of chunks.
+
+    Args:
+        by: Grouping columns, e.g. ``["Date"]`` or ``["Date", "Machine_ID"]``.
+    """
+
+    def __init__(self, by: Sequence[str] = ("Date",)):
+        self.by = list(by)
+        self.totals: Dict[Tuple, object] = {}
+        self.rows = 0
+        self.negative_rows = 0
+        self._dtype = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.rows += len(chunk)
+        self.negative_rows += int((chunk[UNITS_COLUMN] < 0).sum())
+        partial = chunk.groupby(self.by)[UNITS_COLUMN].sum()
+        if self._dtype is None or partial.dtype.kind == "f":
+            self._dtype = partial.dtype
+        for key, value in partial.items():
+            key = key if isinstance(key, tuple) else (key,)
+            self.totals[key] = self.totals.get(key, 0) + value
+
+    def consume(self, chunks: Iterable[pd.DataFrame]) -> "StreamingAggregator":
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def result(self) -> pd.DataFrame:
+        """Return the summary in the same shape as ``groupby(...).sum().reset_index()``."""
+        keys = sorted(self.totals)
+        if not keys:
+            return pd.DataFrame(columns=[*self.by, UNITS_COLUMN])
+        if len(self.by) == 1:
+            index = pd.Index([key[0] for key in keys], name=self.by[0])
+        else:
+            index = pd.MultiIndex.from_tuples(keys, names=self.by)
+        values = pd.Series([self.totals[key] for key in keys], index=index, name=UNITS_COLUMN,
+                           dtype=self._dtype or "int64")
+        return values.reset_index()
+
+
+def aggregate_stream(paths: Iterable[str], by: Sequence[str] = ("Date",),
+                     chunk_rows: int = DEFAULT_CHUNK_ROWS) -> pd.DataFrame:
+    return StreamingAggregator(by).consume(iter_clean_chunks(paths, chunk_rows)).result()
@@ -0,0 +1,180 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Online (streaming) anomaly detection for production readings
+# Developed using Python by Heider Jeffer
+#
+# Keeps incremental statistics per Machine_ID and flags each new reading in
+# O(1) time and memory, without recomputing over history. Three estimators:
+#   - "welford": running mean/variance over everything seen (Welford)
+#   - "ewma":    exponentially weighted mean/variance (adapts to drift)
+#   - "rolling": mean/variance over the last ``window`` readings (ring buffer)
+# A reading is anomalous when abs(x - mu) > k * sigma, the same threshold test
+# as is_anomaly(), scored against the statistics *before* the reading is added.
+import math
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+
+class WelfordStats:
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+
+    def std(self, ddof: int = 0) -> float:
+        if self.count - ddof <= 0:
+            return 0.0
+        return math.sqrt(self._m2 / (self.count - ddof))
+
+
+class EwmaStats:
+    """Exponentially weighted mean and variance with smoothing factor ``alpha``."""
+
+    __slots__ = ("alpha", "count", "mean", "_var")
+
+    def __init__(self, alpha: float = 0.1):
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1].")
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self._var = 0.0
+
+    def update(self, x: float) -> None:
+        self.count += 1
+        if self.count == 1:
+            self.mean = x
+            return
+        delta = x - self.mean
+        self.mean += self.alpha * delta
+        self._var = (1 - self.alpha) * (self._var + self.alpha * delta * delta)
+
+    def std(self, ddof: int = 0) -> float:
+        return math.sqrt(self._var)
+
+
+class RollingStats:
+    """Mean and variance over the last ``window`` values, kept in a ring buffer."""
+
+    __slots__ = ("window", "count", "_buffer", "_pos", "_sum", "_sumsq")
+
+    def __init__(self, window: int = 30):
+        if window < 2:
+            raise ValueError("window must be at least 2.")
+        self.window = window
+        self.count = 0
+        self._buffer = [0.0] * window
+        self._pos = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def update(self, x: float) -> None:
+        if self.count == self.window:
+            old = self._buffer[self._pos]
+            self._sum -= old
+            self._sumsq -= old * old
+        else:
+            self.count += 1
+        self._buffer[self._pos] = x
+        self._pos = (self._pos + 1) % self.window
+        self._sum += x
+        self._sumsq += x * x
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self.count if self.count else 0.0
+
+    def std(self, ddof: int = 0) -> float:
+        if self.count - ddof <= 0:
+            return 0.0
+        mean = self.mean
+        variance = (self._sumsq - self.count * mean * mean) / (self.count - ddof)
+        return math.sqrt(max(variance, 0.0))
+
+
+@dataclass(frozen=True)
+class AnomalyScore:
+    machine_id: Hashable
+    value: float
+    mean: float
+    std: float
+    is_anomaly: bool
+
+
+class StreamingAnomalyDetector:
+    """Per-machine online anomaly detector.
+
+    Args:
+        k: Threshold multiplier, as in ``is_anomaly(x_i, mu, sigma, k)``.
+        method: ``"welford"``, ``"ewma"`` or ``"rolling"``.
+        alpha: Smoothing factor for ``"ewma"``.
+        window: Ring buffer size for ``"rolling"``.
+        warmup: Readings per machine before anything is flagged.
+        low_ratio: Optionally also flag readings below ``low_ratio * mean``
+            (the DailyOutputMonitor "low output" rule, e.g. 0.8).
+        update_on_anomaly: Whether flagged readings feed the statistics.
+    """
+
+    METHODS = ("welford", "ewma", "rolling")
+
+    def __init__(self, k: float = 2.0, method: str = "welford", alpha: float = 0.1, window: int = 30,
+                 warmup: int = 5, low_ratio: Optional[float] = None, update_on_anomaly: bool = True):
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}, got {method!r}.")
+        self.k = k
+        self.method = method
+        self.alpha = alpha
+        self.window = window
+        self.warmup = max(warmup, 1)
+        self.low_ratio = low_ratio
+        self.update_on_anomaly = update_on_anomaly
+        self._stats: Dict[Hashable, object] = {}
+
+    def _new_stats(self):
+        if self.method == "ewma":
+            return EwmaStats(self.alpha)
+        if self.method == "rolling":
+            return RollingStats(self.window)
+        return WelfordStats()
+
+    def stats(self, machine_id: Hashable):
+        stats = self._stats.get(machine_id)
+        if stats is None:
+            stats = self._stats[machine_id] = self._new_stats()
+        return stats
+
+    def score(self, machine_id: Hashable, value: float) -> AnomalyScore:
+        """Flag ``value`` against the machine's history, then add it to the history."""
+        stats = self.stats(machine_id)
+        mean, std = stats.mean, stats.std()
+        flagged = False
+        if stats.count >= self.warmup:
+            flagged = abs(value - mean) > self.k * std
+            if self.low_ratio is not None:
+                flagged = flagged or value < self.low_ratio * mean
+        if not flagged or self.update_on_anomaly:
+            stats.update(float(value))
+        return AnomalyScore(machine_id, value, mean, std, flagged)
+
+    def score_stream(self, readings: Iterable[Tuple[Hashable, float]]) -> Iterator[AnomalyScore]:
+        for machine_id, value in readings:
+            yield self.score(machine_id, value)
+
+    def score_frame(self, df: pd.DataFrame, value_col: str = "Production_Units",
+                    machine_col: str = "Machine_ID") -> pd.DataFrame:
+        """Replay ``df`` row by row (in its current order) and append the scores."""
+        scores = list(self.score_stream(zip(df[machine_col], df[value_col])))
+        out = df.copy()
+        out["Expected"] = [s.mean for s in scores]
+        out["Sigma"] = [s.std for s in scores]
+        out["Anomaly"] = [s.is_anomaly for s in scores]
+        return out
@@ -0,0 +1,37 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Shared pytest setup for the pipeline tests
+# Developed using Python by Heider Jeffer
+#
+# The pipeline modules live in jupyter/ and import each other by module name,
+# as they do when run from that directory.
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "jupyter"))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run the test inside a fresh directory; the modules' default paths are relative."""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("factory_reports")
+    return tmp_path
+
+
+def make_report(seed: int, rows: int = 200, days: int = 10, machines=("M1", "M2", "M3"), shifts: bool = False,
+                start: str = "2025-01-01") -> pd.DataFrame:
+    """A factory_reports-style frame with fixed random content."""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "Date": pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, rows), unit="D"),
+        "Machine_ID": rng.choice(list(machines), rows),
+        "Production_Units": rng.integers(0, 100, rows),
+    })
+    if shifts:
+        frame["Shift"] = rng.integers(1, 4, rows)
+    return frame
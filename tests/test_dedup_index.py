@@ -0,0 +1,86 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Re-sent and overlapping reports in the daily summary store
+# Developed using Python by Heider Jeffer
+import logging
+import os
+
+import pandas as pd
+import pytest
+
+from dedup_index import source_lineage
+from report_ingestion import IngestionEngine
+from summary_store import DailySummaryStore
+
+_mtime = iter(range(1_700_000_000, 1_800_000_000, 60))
+
+
+def write(name, rows, columns=("Date", "Machine_ID", "Production_Units")):
+    """Write a CSV report with a strictly later mtime than every earlier one (the version order)."""
+    path = os.path.join("factory_reports", name)
+    pd.DataFrame(rows, columns=list(columns)).to_csv(path, index=False)
+    stamp = next(_mtime)
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def run():
+    store = DailySummaryStore()
+    store.sync(IngestionEngine("factory_reports/*", max_workers=1).run())
+    return store
+
+
+def daily(store):
+    return store.summary()["Production_Units"].tolist()
+
+
+@pytest.mark.parametrize("path, lineage", [
+    ("r/report1.xlsx", os.path.join("r", "report1")),
+    ("r/report1_corrected.xlsx", os.path.join("r", "report1")),
+    ("r/report1 (2).csv", os.path.join("r", "report1")),
+    ("r/report1_v3.xlsx", os.path.join("r", "report1")),
+    ("r/report2.xlsx", os.path.join("r", "report2")),
+])
+def test_source_lineage(path, lineage):
+    assert source_lineage(path) == lineage
+
+
+def test_resend_replaces_and_delete_restores(workdir):
+    write("report1.csv", [("2025-01-01", "M1", 100), ("2025-01-01", "M2", 150), ("2025-01-02", "M1", 70)])
+    assert daily(run()) == [250, 70]
+    write("report1_corrected.csv", [("2025-01-01", "M1", 110), ("2025-01-01", "M2", 150), ("2025-01-02", "M1", 75)])
+    assert daily(run()) == [260, 75]
+    os.remove("factory_reports/report1_corrected.csv")
+    assert daily(run()) == [250, 70]
+
+
+def test_shift_key_supersedes_across_files(workdir):
+    columns = ("Date", "Machine_ID", "Shift", "Production_Units")
+    write("line_a.csv", [("2025-01-01", "M1", 1, 100), ("2025-01-01", "M1", 2, 50)], columns)
+    assert daily(run()) == [150]
+    write("line_b.csv", [("2025-01-01", "M1", 1, 120)], columns)
+    assert daily(run()) == [170]
+    os.remove("factory_reports/line_b.csv")
+    assert daily(run()) == [150]
+
+
+def test_without_shift_other_reports_are_summed(workdir, caplog):
+    write("line_a.csv", [("2025-01-01", "M1", 100), ("2025-01-01", "M2", 300)])
+    run()
+    write("line_b.csv", [("2025-01-01", "M1", 100), ("2025-01-01", "M1", 10)])
+    with caplog.at_level(logging.WARNING, logger="summary_store"):
+        assert daily(run()) == [510]
+    assert "exactly match" in caplog.text  # the identical M1 row is counted but reported
+
+
+def test_superseded_index_files_are_collected(workdir):
+    write("report1.csv", [("2025-01-01", "M1", 1), ("2025-02-01", "M1", 2)])
+    run()
+    write("report1_fixed.csv", [("2025-01-01", "M1", 3), ("2025-02-01", "M1", 4)])
+    run()
+    os.remove("factory_reports/report1.csv")
+    store = run()
+    referenced = set()
+    for files in store.index.state()["files"].values():
+        referenced.update(name for name in [files["counted"], *files["superseded"]] if name)
+    assert set(os.listdir(store.index_dir)) == referenced
+    assert daily(store) == [3, 4]
@@ -0,0 +1,108 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Resumable, checksummed ERP uploads
+# Developed using Python by Heider Jeffer
+import asyncio
+import os
+import threading
+
+import pytest
+
+from erp_upload import (DirectoryTarget, ErpUploader, HttpTarget, StandInServer, TransferError, UploadQueue,
+                        file_sha256, upload_reports)
+
+CHUNK = 1024
+
+
+class RecordingTarget(DirectoryTarget):
+    """DirectoryTarget that logs the offset of every chunk it is sent."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.offsets = []
+
+    def write_sync(self, name, sha256, offset, data, total):
+        self.offsets.append(offset)
+        return super().write_sync(name, sha256, offset, data, total)
+
+
+class DownTarget(DirectoryTarget):
+    def status_sync(self, name, sha256):
+        raise TransferError("ERP unreachable")
+
+
+@pytest.fixture
+def report(workdir):
+    path = os.path.join(workdir, "summary_report_2025-01-01.xlsx")
+    with open(path, "wb") as fh:
+        fh.write(os.urandom(5 * CHUNK + 123))
+    return path
+
+
+def drain(target, queue_path, reports=(), **options):
+    queue = UploadQueue(queue_path)
+    for report in reports:
+        queue.enqueue(report)
+    return asyncio.run(ErpUploader(target, queue, chunk_size=CHUNK, **options).drain())
+
+
+def test_upload_writes_file_and_checksum(report):
+    target = DirectoryTarget("erp")
+    assert drain(target, "queue.json", [report]) == {"done": 1}
+    with open(report, "rb") as src, open(os.path.join("erp", os.path.basename(report)), "rb") as dst:
+        assert src.read() == dst.read()
+    assert target.stored_sha256(os.path.basename(report)) == file_sha256(report)
+    assert not [name for name in os.listdir("erp") if name.endswith(".part")]
+
+
+def test_interrupted_upload_resumes_at_received_offset(report):
+    name, sha256, size = os.path.basename(report), file_sha256(report), os.path.getsize(report)
+    with open(report, "rb") as fh:
+        head = fh.read(2 * CHUNK)
+    DirectoryTarget("erp").write_sync(name, sha256, 0, head, size)  # a run died after two chunks
+
+    target = RecordingTarget("erp")
+    assert drain(target, "queue.json", [report]) == {"done": 1}
+    assert target.offsets[0] == 2 * CHUNK
+    assert target.stored_sha256(name) == sha256
+
+
+def test_report_the_target_already_holds_is_skipped(report):
+    drain(DirectoryTarget("erp"), "queue.json", [report])
+    target = RecordingTarget("erp")
+    # A fresh queue knows nothing about the earlier upload; the target-side checksum does
+    assert drain(target, "other_queue.json", [report]) == {"skipped": 1}
+    assert target.offsets == []
+
+
+def test_outage_keeps_the_job_queued_for_a_later_run(report):
+    assert drain(DownTarget("erp"), "queue.json", [report], retry_within=0.0) == {"pending": 1}
+    queue = UploadQueue("queue.json")
+    job, = queue.pending()
+    assert job.attempts == 1 and job.last_error
+    # The backoff has not passed yet: the next run does not try it
+    assert drain(DirectoryTarget("erp"), "queue.json", retry_within=0.0) == {"pending": 1}
+    job.next_attempt = 0.0  # the backoff has passed
+    queue.save()
+    assert drain(DirectoryTarget("erp"), "queue.json") == {"done": 1}
+
+
+def test_vanished_report_fails_instead_of_retrying(report):
+    queue = UploadQueue("queue.json")
+    queue.enqueue(report)
+    os.remove(report)
+    assert drain(DirectoryTarget("erp"), "queue.json") == {"failed": 1}
+
+
+def test_http_stand_in_resumes_and_skips(report):
+    server = StandInServer(root="erp")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        name, sha256, size = os.path.basename(report), file_sha256(report), os.path.getsize(report)
+        with open(report, "rb") as fh:
+            server.target.write_sync(name, sha256, 0, fh.read(CHUNK), size)
+        assert upload_reports([report], HttpTarget(server.url), "queue.json", chunk_size=CHUNK) == {"done": 1}
+        assert server.target.stored_sha256(name) == sha256
+        assert upload_reports([report], HttpTarget(server.url), "fresh.json") == {"skipped": 1}
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,71 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Partitioned history queries must match a pandas filter
+# Developed using Python by Heider Jeffer
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import make_report
+from partitioned_store import PartitionedStore
+from report_ingestion import IngestionEngine
+from report_readers import read_report_file
+
+
+def ingest():
+    store = PartitionedStore()
+    store.sync(IngestionEngine("factory_reports/*", max_workers=1).run())
+    return store
+
+
+def history():
+    paths = sorted(os.path.join("factory_reports", name) for name in os.listdir("factory_reports"))
+    return pd.concat([read_report_file(path) for path in paths], ignore_index=True)
+
+
+def normalized(frame):
+    frame = frame[["Date", "Machine_ID", "Production_Units"]].astype(
+        {"Date": "datetime64[ns]", "Machine_ID": str, "Production_Units": "int64"})
+    return frame.sort_values(list(frame.columns)).reset_index(drop=True)
+
+
+@pytest.fixture
+def store(workdir):
+    make_report(1, days=20).to_csv("factory_reports/line_a.csv", index=False)
+    make_report(2, days=20).to_parquet("factory_reports/line_b.parquet", index=False)
+    return ingest()
+
+
+@pytest.mark.parametrize("start, end, machines", [
+    (None, None, None),
+    ("2025-01-05", "2025-01-09", None),
+    ("2025-01-15", None, ["M2"]),
+    (None, "2025-01-03", ["M1", "M3"]),
+])
+def test_query_matches_pandas_filter(store, start, end, machines):
+    df = history()
+    mask = pd.Series(True, index=df.index)
+    if start is not None:
+        mask &= df["Date"] >= pd.Timestamp(start)
+    if end is not None:
+        mask &= df["Date"] <= pd.Timestamp(end)
+    if machines is not None:
+        mask &= df["Machine_ID"].astype(str).isin(machines)
+    pd.testing.assert_frame_equal(normalized(store.query(start, end, machines)), normalized(df[mask]))
+
+
+def test_query_prunes_partitions(store):
+    one_day = store.partitions("2025-01-05", "2025-01-05")
+    assert one_day and len(one_day) < len(store.index)
+    assert {p.day for p in one_day} == {"2025-01-05"}
+
+
+def test_removed_file_leaves_the_store(store):
+    os.remove("factory_reports/line_b.parquet")
+    store = ingest()
+    assert store.sources == {os.path.join("factory_reports", "line_a.csv")}
+    pd.testing.assert_frame_equal(normalized(store.query()), normalized(history()))
+
+
+def test_empty_store_has_no_date_range(workdir):
+    assert PartitionedStore().date_range() == (None, None)
@@ -0,0 +1,89 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Data-quality rule counts on small fixed frames
+# Developed using Python by Heider Jeffer
+import numpy as np
+import pandas as pd
+import pytest
+
+from quality_rules import QualityChecker, check_quality, default_rules
+from report_ingestion import SOURCE_COLUMN
+
+EXPECTED = {
+    "Date_missing": 1,
+    "Date_out_of_range": 2,
+    "Production_Units_missing": 1,
+    "Production_Units_negative": 1,
+    "Machine_ID_missing": 1,
+    "Machine_ID_unknown": 1,
+    "duplicate_key": 1,
+    "Production_Units_outlier": 0,
+}
+
+
+@pytest.fixture
+def rows():
+    """One violation per row after the first (the Shift value makes a record key)."""
+    return pd.DataFrame({
+        "Date": ["2025-01-01", None, "1990-01-01", "2025-01-01", "2025-01-02", "2025-01-02", "2025-01-02",
+                 "2025-01-01", "not a date"],
+        "Machine_ID": ["M1", "M1", "M2", "M2", "M3", None, "X9", "M1", "M4"],
+        "Shift": [1, 1, 1, 1, 1, 1, 1, 1, 2],
+        "Production_Units": [10, 10, 5, -3, np.nan, 4, 4, 12, 8],
+    })
+
+
+def counts(report):
+    return {rule: int(report.dataset[rule]) for rule in report.rules}
+
+
+def test_rule_counts(rows):
+    report = check_quality(rows)
+    assert counts(report) == EXPECTED
+    assert report.error_rows == 8
+    assert report.data_quality == pytest.approx(1 / 9)
+
+
+def test_chunked_check_matches_whole_frame(rows):
+    report = QualityChecker().check_frame(rows, chunk_rows=2)
+    assert counts(report) == EXPECTED
+    assert report.error_rows == 8
+
+
+def test_counts_are_attributed_per_file(rows):
+    rows[SOURCE_COLUMN] = ["a.csv"] * 4 + ["b.csv"] * 5
+    by_file = check_quality(rows).by_file.set_index("File")
+    assert by_file.loc["a.csv", "Error_Rows"] == 3
+    assert by_file.loc["b.csv", "Error_Rows"] == 4  # row 7 repeats a key of a.csv: a re-send, not an error
+    assert by_file.loc["b.csv", "duplicate_key"] == 0
+
+
+def test_known_machine_list_replaces_the_pattern(rows):
+    report = check_quality(rows, default_rules(["M1", "M2", "M3", "X9"]))
+    assert report.dataset["Machine_ID_unknown"] == 1  # M4
+
+
+def test_no_duplicates_without_a_shift_column(rows):
+    # Per-shift or per-line exports legitimately repeat (Date, Machine_ID)
+    report = check_quality(rows.drop(columns="Shift"))
+    assert report.dataset["duplicate_key"] == 0
+
+
+def test_outlier_within_machine():
+    steady = pd.DataFrame({"Date": "2025-01-01", "Machine_ID": "M1", "Shift": range(31),
+                           "Production_Units": [10] * 30 + [1000]})
+    report = check_quality(steady)
+    assert report.dataset["Production_Units_outlier"] == 1
+
+
+def test_streaming_tap_counts_per_source(rows):
+    checker = QualityChecker()
+    chunks = [rows.iloc[:4], rows.iloc[4:]]
+    assert list(checker.tap(chunks, source="r.xlsx")) == chunks
+    report = checker.report()
+    assert report.by_file["File"].tolist() == ["r.xlsx"]
+    assert counts(report) == EXPECTED
+
+
+def test_nullable_units(rows):
+    rows["Production_Units"] = pd.array([10, 10, 5, -3, None, 4, 4, 12, 8], dtype="Int64")
+    assert counts(check_quality(rows)) == EXPECTED
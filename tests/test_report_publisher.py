@@ -0,0 +1,106 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Atomic, deduplicated report publishing
+# Developed using Python by Heider Jeffer
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from report_publisher import OBJECTS_DIR, ReportPublisher
+
+NAME = "summary_report_2025-01-01.xlsx"
+
+
+@pytest.fixture
+def publisher(workdir):
+    return ReportPublisher("reports")
+
+
+def frame(value):
+    return pd.DataFrame({"Date": pd.to_datetime(["2025-01-01", "2025-01-02"]), "Production_Units": [value, 2]})
+
+
+def objects(publisher):
+    return sorted(os.listdir(publisher.objects_dir))
+
+
+def leftovers(publisher):
+    """Temp files left in the output or object directory."""
+    names = os.listdir(publisher.output_dir) + os.listdir(publisher.objects_dir)
+    return [name for name in names if ".tmp" in name]
+
+
+def test_identical_data_is_stored_once(publisher):
+    first = publisher.publish_frame(frame(1), NAME)
+    second = publisher.publish_frame(frame(1), NAME)
+    other = publisher.publish_frame(frame(1), "summary_report_2025-01-02.xlsx")
+    assert not first.reused and second.reused and other.reused
+    assert len(objects(publisher)) == 1
+    assert os.path.samefile(first.path, other.path)
+    pd.testing.assert_frame_equal(pd.read_excel(first.path), frame(1))
+
+
+def test_republish_replaces_the_file_instead_of_writing_into_it(publisher):
+    path = publisher.publish_frame(frame(1), NAME).path
+    with open(path, "rb") as reader:  # e.g. the ERP upload, reading the earlier version
+        publisher.publish_frame(frame(5), NAME)
+        before = pd.read_excel(reader)
+    pd.testing.assert_frame_equal(before, frame(1))
+    pd.testing.assert_frame_equal(pd.read_excel(path), frame(5))
+    assert leftovers(publisher) == []
+
+
+def test_concurrent_publishers_leave_a_complete_report(publisher):
+    frames = [frame(value) for value in range(6)]
+    errors = []
+
+    def publish(data):
+        try:
+            ReportPublisher("reports").publish_frame(data, NAME)
+        except Exception as exc:  # surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=publish, args=(data,)) for data in frames]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    published = pd.read_excel(os.path.join("reports", NAME))
+    assert any(published.equals(data) for data in frames)
+    assert len(objects(publisher)) == len(frames)
+    assert leftovers(publisher) == []
+
+
+def test_garbage_collection_keeps_linked_objects(publisher):
+    publisher.publish_frame(frame(1), NAME)
+    publisher.publish_frame(frame(5), NAME)
+    assert len(objects(publisher)) == 2
+    assert publisher.collect_garbage(min_age_seconds=3600) == 0  # the unlinked object is still young
+    assert publisher.collect_garbage(min_age_seconds=-1) == 1
+    kept, = objects(publisher)
+    assert os.path.samefile(os.path.join(publisher.objects_dir, kept), os.path.join("reports", NAME))
+
+
+def test_publish_survives_garbage_collection_of_its_object(publisher):
+    old = publisher.publish_frame(frame(1), NAME)
+    publisher.publish_frame(frame(5), NAME)  # the frame(1) object is now unlinked
+    store_object = publisher.store_object
+    collected = []
+
+    def store_then_collect(write, key, suffix):
+        stored = store_object(write, key, suffix)
+        if not collected:  # a concurrent cleanup wins the race once
+            collected.append(publisher.collect_garbage(min_age_seconds=-1))
+        return stored
+
+    publisher.store_object = store_then_collect
+    again = publisher.publish_frame(frame(1), "summary_report_2025-01-02.xlsx")
+    assert collected == [1] and again.key == old.key
+    pd.testing.assert_frame_equal(pd.read_excel(again.path), frame(1))
+
+
+def test_objects_live_in_the_objects_directory(publisher):
+    publisher.publish_frame(frame(1), NAME)
+    assert sorted(os.listdir("reports")) == sorted([".locks", OBJECTS_DIR, NAME])
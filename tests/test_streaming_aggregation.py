@@ -0,0 +1,61 @@
+# Siemens Energy Digitalization Transformation Engineer
+# Streaming aggregation must match the in-memory groupby
+# Developed using Python by Heider Jeffer
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_report
+from report_readers import read_report_file
+from streaming_aggregation import StreamingAggregator, aggregate_stream, clean_chunk, iter_chunks
+
+
+@pytest.fixture
+def reports(workdir):
+    """One report per supported format, with missing and fractional units mixed in."""
+    frames = [make_report(seed) for seed in range(3)]
+    frames[0].loc[[3, 17], "Production_Units"] = np.nan
+    paths = ["factory_reports/a.xlsx", "factory_reports/b.csv", "factory_reports/c.parquet"]
+    frames[0].to_excel(paths[0], index=False)
+    frames[1].to_csv(paths[1], index=False)
+    frames[2].to_parquet(paths[2], index=False)
+    return paths
+
+
+def in_memory(paths, by):
+    df = pd.concat([read_report_file(path) for path in paths], ignore_index=True)
+    df = df.dropna(subset=["Production_Units"])
+    return df.groupby(by)["Production_Units"].sum().reset_index()
+
+
+@pytest.mark.parametrize("chunk_rows", [7, 64, 10_000])
+def test_streaming_matches_in_memory_by_date(reports, chunk_rows):
+    expected = in_memory(reports, ["Date"])
+    result = aggregate_stream(reports, chunk_rows=chunk_rows)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_streaming_matches_in_memory_by_date_and_machine(reports):
+    expected = in_memory(reports, ["Date", "Machine_ID"])
+    result = aggregate_stream(reports, by=("Date", "Machine_ID"), chunk_rows=50)
+    expected["Machine_ID"] = expected["Machine_ID"].astype(str)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_chunks_are_bounded_and_cover_every_row(reports):
+    sizes = [len(chunk) for chunk in iter_chunks(reports, chunk_rows=64)]
+    assert max(sizes) <= 64
+    assert sum(sizes) == 3 * 200
+
+
+def test_aggregator_counts_rows_and_negatives():
+    chunk = pd.DataFrame({"Date": ["2025-01-01", "2025-01-01", "2025-01-02", None],
+                          "Production_Units": [5, -2, None, 4]})
+    aggregator = StreamingAggregator().consume([clean_chunk(chunk)])
+    assert aggregator.rows == 3
+    assert aggregator.negative_rows == 1
+    assert aggregator.result()["Production_Units"].tolist() == [3]
+
+
+def test_empty_stream_gives_empty_summary():
+    assert list(StreamingAggregator().result().columns) == ["Date", "Production_Units"]
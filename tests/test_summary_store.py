@@ -0,0 +1,81 @@
+# Siemens Energy Digitalization Transformation Engineer
+# The incremental daily summary must equal a full recomputation
+# Developed using Python by Heider Jeffer
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import make_report
+from report_ingestion import IngestionEngine
+from report_readers import read_report_file
+from summary_store import DailySummaryStore
+
+
+def run(by=("Date",)):
+    """One ingestion run applied to a freshly loaded store, like a batch run."""
+    result = IngestionEngine("factory_reports/*", max_workers=1).run()
+    store = DailySummaryStore()
+    store.sync(result)
+    return store.summary(by)
+
+
+def recompute(by=("Date",)):
+    paths = sorted(os.path.join("factory_reports", name) for name in os.listdir("factory_reports"))
+    df = pd.concat([read_report_file(path) for path in paths], ignore_index=True)
+    df = df.dropna(subset=["Production_Units"])
+    return df.groupby(list(by))["Production_Units"].sum().reset_index()
+
+
+def assert_matches_recompute(summary, by=("Date",)):
+    expected = recompute(by)
+    if "Machine_ID" in by:
+        expected["Machine_ID"] = expected["Machine_ID"].astype(str)
+        summary = summary.assign(Machine_ID=summary["Machine_ID"].astype(str))
+    pd.testing.assert_frame_equal(summary.reset_index(drop=True), expected, check_dtype=False)
+
+
+@pytest.fixture
+def two_reports(workdir):
+    make_report(1).to_csv("factory_reports/line_a.csv", index=False)
+    make_report(2).to_csv("factory_reports/line_b.csv", index=False)
+
+
+def test_new_files_are_added(two_reports):
+    assert_matches_recompute(run())
+    make_report(3, start="2025-01-05").to_csv("factory_reports/line_c.csv", index=False)
+    assert_matches_recompute(run())
+    assert_matches_recompute(run(("Date", "Machine_ID")), ("Date", "Machine_ID"))
+
+
+def test_changed_file_replaces_its_contribution(two_reports):
+    before = run()
+    changed = make_report(1)
+    changed["Production_Units"] += 1000
+    changed.to_csv("factory_reports/line_a.csv", index=False)
+    after = run()
+    assert_matches_recompute(after)
+    assert after["Production_Units"].sum() == before["Production_Units"].sum() + 1000 * len(changed)
+
+
+def test_deleted_file_is_retracted(two_reports):
+    before = run()
+    make_report(9).to_csv("factory_reports/line_c.csv", index=False)
+    assert not run().equals(before)
+    os.remove("factory_reports/line_c.csv")
+    pd.testing.assert_frame_equal(run(), before)
+
+
+def test_deleting_every_file_empties_the_summary(two_reports):
+    run()
+    for name in os.listdir("factory_reports"):
+        os.remove(os.path.join("factory_reports", name))
+    assert run().empty
+
+
+def test_unchanged_run_applies_nothing(two_reports):
+    first = run()
+    result = IngestionEngine("factory_reports/*", max_workers=1).run()
+    store = DailySummaryStore()
+    assert store.sync(result) == 0
+    pd.testing.assert_frame_equal(store.summary(), first)